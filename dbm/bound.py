@@ -2,6 +2,18 @@
 """
 import math
 from enum import Enum
+from typing import Dict, Union, cast
+
+# Bounds can be encoded into a single integer, the raw representation. The
+# numeric value n and the type of the bound are packed as
+#   ≤ n  ->  2 * n + 1
+#   < n  ->  2 * n
+# such that the integer order coincides with the order on bounds. The
+# unbounded / infinite bound is represented by the sentinel INF.
+# See also UPPAAL's DBM library https://github.com/UPPAALModelChecker/UDBM
+INF = (1 << 62) - 1
+# Raw representation of the bound ≤ 0
+LE_ZERO = 1
 
 
 class BoundType(Enum):
@@ -25,11 +37,41 @@ class Bound:
 
     All operations implemented here were formally defined in the paper
     https://www.seas.upenn.edu/~lee/09cis480/papers/by-lncs04.pdf
+
+    Bounds are immutable. Therefore, `unbounded`, `leq`, `le` and `from_raw`
+    return shared instances for interned values (see `intern`) and copies of
+    a Bound are the Bound itself.
     """
 
-    def __init__(self, n: int, ty: BoundType) -> None:
-        self.n = n
-        self.ty = ty
+    __slots__ = ("n", "ty")
+
+    # numeric value, math.inf for the unbounded bound
+    n: Union[int, float]
+    ty: BoundType
+
+    def __init__(self, n: Union[int, float], ty: BoundType) -> None:
+        object.__setattr__(self, "n", n)
+        object.__setattr__(self, "ty", ty)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("Bound is immutable")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError("Bound is immutable")
+
+    def __copy__(self) -> "Bound":
+        return self
+
+    def __deepcopy__(self, memo) -> "Bound":
+        return self
+
+    def __reduce__(self):
+        # restore shared instances when unpickling
+        return (Bound.from_raw, (self.to_raw(),))
+
+    def __hash__(self) -> int:
+        # consistent with __eq__, all unbounded Bounds are equal
+        return hash(self.to_raw())
 
     def __str__(self) -> str:
         return f"({self.n},{self.ty})"
@@ -82,15 +124,29 @@ class Bound:
         else:
             n = self.n + other.n
             if (self.ty == BoundType.LEQ) and (other.ty == BoundType.LEQ):
-                ty = BoundType.LEQ
+                return Bound.leq(n)
             else:
-                ty = BoundType.LESS
-
-            return Bound(n, ty)
+                return Bound.le(n)
 
     def __neg__(self) -> "Bound":
         """Returns a Bound with negated numeric value"""
-        return Bound(-self.n, self.ty)
+        n = -cast(int, self.n)
+        if self.ty == BoundType.LEQ:
+            return Bound.leq(n)
+        return Bound.le(n)
+
+    def to_raw(self) -> int:
+        """Encodes the Bound in its integer (raw) representation
+
+        Returns:
+            the raw representation of the bound
+        """
+        if self.is_unbounded():
+            return INF
+        n = cast(int, self.n)
+        if self.ty == BoundType.LEQ:
+            return 2 * n + 1
+        return 2 * n
 
     def is_unbounded(self) -> bool:
         """Checks whether it is an unbounded / infinite constraint
@@ -104,25 +160,27 @@ class Bound:
         """Returns the numeric value of the Bound
 
         Returns:
-            the integer value of the bound
+            the integer value of the bound, math.inf if it is unbounded
         """
-        return self.n
+        return cast(int, self.n)
 
     def get_value_abs(self) -> int:
         """Returns the absolute numeric value of the Bound
 
         Returns:
-            the absolute integer value of the bound
+            the absolute integer value of the bound, math.inf if it is
+            unbounded
         """
-        if self.n < 0:
-            return -self.n
+        n = cast(int, self.n)
+        if n < 0:
+            return -n
         else:
-            return self.n
+            return n
 
     @classmethod
     def unbounded(cls) -> "Bound":
-        """Creates a new infinite or unbounded Bound"""
-        return Bound(math.inf, BoundType.LEQ)  # type: ignore
+        """Returns the infinite or unbounded Bound"""
+        return UNBOUNDED
 
     @classmethod
     def leq(cls, n: int) -> "Bound":
@@ -133,9 +191,12 @@ class Bound:
             n (int): the numeric upper bound
 
         Returns:
-            a new Bound object
+            a Bound object
         """
-        return Bound(n, BoundType.LEQ)
+        b = INTERNED.get(2 * n + 1)
+        if b is None:
+            return Bound(n, BoundType.LEQ)
+        return b
 
     @classmethod
     def le(cls, n: int) -> "Bound":
@@ -146,6 +207,88 @@ class Bound:
             n (int): the numeric upper bound
 
         Returns:
-            a new Bound object
+            a Bound object
+        """
+        b = INTERNED.get(2 * n)
+        if b is None:
+            return Bound(n, BoundType.LESS)
+        return b
+
+    @classmethod
+    def from_raw(cls, raw: int) -> "Bound":
+        """Decodes a Bound from its integer (raw) representation
+
+        Args:
+            raw (int): raw representation of the bound
+
+        Returns:
+            a Bound object
         """
-        return Bound(n, BoundType.LESS)
+        b = INTERNED.get(raw)
+        if b is not None:
+            return b
+        if raw & 1:
+            return Bound(raw >> 1, BoundType.LEQ)
+        return Bound(raw >> 1, BoundType.LESS)
+
+    @classmethod
+    def intern(cls, max_constant: int) -> None:
+        """Replaces the shared instances by the unbounded bound and all
+        bounds with an absolute value of at most `max_constant`, e.g. the
+        maximal guard constant of an automaton. Bounds interned for a
+        previous automaton are released.
+
+        Args:
+            max_constant (int): maximal absolute value to intern
+        """
+        INTERNED.clear()
+        INTERNED[INF] = UNBOUNDED
+        for n in range(-max_constant, max_constant + 1):
+            for raw in (2 * n, 2 * n + 1):
+                INTERNED[raw] = Bound.from_raw(raw)
+
+
+# Shared Bound instances indexed by their raw representation
+UNBOUNDED = Bound(math.inf, BoundType.LEQ)
+INTERNED: Dict[int, "Bound"] = {}
+Bound.intern(0)
+
+
+def raw_add(a: int, b: int) -> int:
+    """+ on the raw representation of two bounds
+
+    Args:
+        a (int): raw representation of the first bound
+        b (int): raw representation of the second bound
+
+    Returns:
+        raw representation of the sum
+    """
+    if INF in (a, b):
+        return INF
+    # the result is only non-strict if both bounds are non-strict
+    return a + b - ((a | b) & 1)
+
+
+def raw_value(raw: int) -> float:
+    """Returns the numeric value of a bound in raw representation
+
+    Args:
+        raw (int): raw representation of the bound
+
+    Returns:
+        the numeric value, math.inf for the unbounded bound
+    """
+    if raw == INF:
+        return math.inf
+    return raw >> 1
+
+
+def raw_leq(n: int) -> int:
+    """Returns the raw representation of the bound ≤ n"""
+    return 2 * n + 1
+
+
+def raw_le(n: int) -> int:
+    """Returns the raw representation of the bound < n"""
+    return 2 * n
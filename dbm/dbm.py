@@ -6,22 +6,116 @@
 """
 
 # * IMPROVEMENT:
-#       Currently, canonicalization will always execute the full Floyd Warshall
-#       algorithm rather than checking for which entries that might be
-#       necessary. See
+#       Adding a single constraint to a DBM in canonical form is closed
+#       incrementally and after tightening entries of a canonical DBM only the
+#       touched clocks are used as pivots. Any other direct modification of
+#       the matrix still requires the full Floyd Warshall algorithm. See
 #           https://www.seas.upenn.edu/~lee/09cis480/papers/by-lncs04.pdf
 
-import copy
-from typing import List, Dict, Optional
-from dbm.bound import Bound, BoundType
+from array import array
+from typing import FrozenSet, Iterable, List, Dict, Optional, TypeVar
+from dbm.bound import Bound, INF, LE_ZERO, raw_add
 from dbm.constraint import Constraint, ZERO
 
+T = TypeVar("T", bound="DBM")
+
+
+def floyd_warshall(
+    dist: "array[int]",
+    n: int,
+    base: int = 0,
+    pivots: Optional[Iterable[int]] = None,
+) -> bool:
+    """Executes Floyd Warshall on the graph given as flat n x n matrix in
+    row-major order starting at index `base`, all entries are expected to be
+    bounds in raw representation
+
+    If `pivots` is given, only paths over these vertices are considered. This
+    closes the matrix if it was closed before and only edges between pivots
+    have been tightened since, as every new shortest path is composed of old
+    shortest paths joined at the endpoints of tightened edges.
+
+    A negative cycle, including a cycle of weight < 0, shows up as a diagonal
+    entry below ≤ 0 once one of its vertices has been updated. The closure
+    stops as soon as such an entry is found and the matrix is left partially
+    closed.
+
+    Returns:
+        False if the graph has a negative cycle, i.e. the DBM is empty
+    """
+    for k in range(n) if pivots is None else pivots:
+        k_off = base + k * n
+        # Pick all vertices as source one by one
+        for i in range(n):
+            i_off = base + i * n
+            d_ik = dist[i_off + k]
+            # no path from i over k
+            if d_ik == INF:
+                continue
+            # Pick all vertices as destination for the above picked source
+            for j in range(n):
+                d_kj = dist[k_off + j]
+                if d_kj == INF:
+                    continue
+                # if vertex k is on the shortest path from i to j, then update
+                # the value of dist[i][j] (inlined raw_add)
+                d = d_ik + d_kj - ((d_ik | d_kj) & 1)
+                if d < dist[i_off + j]:
+                    dist[i_off + j] = d
+            if dist[i_off + i] < LE_ZERO:
+                return False
+    return True
+
+
+def close_edge(
+    dist: "array[int]", n: int, i: int, j: int, base: int = 0
+) -> "array[int]":
+    """Restores the canonical form of a flat n x n matrix in raw
+    representation starting at index `base` after the single entry (i, j) has
+    been tightened. The matrix must have been canonical before and the new
+    entry must not introduce a negative cycle.
+    """
+    j_off = base + j * n
+    d_ij = dist[base + i * n + j]
+    for k in range(n):
+        k_off = base + k * n
+        d_ki = dist[k_off + i]
+        if d_ki == INF:
+            continue
+        # shortest path from k to j over the new edge (inlined raw_add)
+        d_kij = d_ki + d_ij - ((d_ki | d_ij) & 1)
+        for l in range(n):
+            d_jl = dist[j_off + l]
+            if d_jl == INF:
+                continue
+            d = d_kij + d_jl - ((d_kij | d_jl) & 1)
+            if d < dist[k_off + l]:
+                dist[k_off + l] = d
+    return dist
+
 
 class DBM:
     """DBM represents a difference bound matrix and allows for operations on
     them.
+
+    Internally, all entries are stored in their raw integer representation
+    (see `dbm.bound`) in a single flat buffer in row-major order, i.e. the
+    entry in row i and column j is located at `raw[i * dim + j]`. `Bound`
+    objects are only created when the matrix is accessed through `m`.
+
+    Copies of a DBM (see `copy`) share the buffer until one of them is
+    modified (copy-on-write). Code modifying `raw` directly has to obtain the
+    buffer through `get_writable_raw`.
+
+    Subclasses for a fixed number of clocks can replace the closure kernels
+    `close_matrix` and `close_matrix_edge` by specialized versions.
     """
 
+    # closes the flat matrix, see `floyd_warshall`
+    close_matrix = staticmethod(floyd_warshall)
+    # closes the flat matrix after tightening a single entry, see `close_edge`
+    close_matrix_edge = staticmethod(close_edge)
+
     def __init__(
         self, clocks: List[str], m: Optional[List[List["Bound"]]] = None
     ) -> None:
@@ -41,32 +135,120 @@ class DBM:
         for i in range(len(clocks)):
             self.clocks[clocks[i]] = i + 1
 
+        self.dim = len(self.clocks)
         self.__is_empty = False
+        # hash of the canonical form, None if it has to be recomputed
+        self.__hash: Optional[int] = None
+        # whether raw might be referenced by a copy of this DBM
+        self.__is_shared = False
+
+        # clocks whose rows and columns have been tightened since the DBM was
+        # canonical, None if the DBM might have been loosened as well
+        self.__touched: Optional[FrozenSet[int]] = None
 
         if not m is None:
-            assert len(m) == len(self.clocks)
-            self.m = m
+            assert len(m) == self.dim
+            self.raw = array("q", [b.to_raw() for row in m for b in row])
             self.__is_canonical = False
             return
 
         # initialize DBM matrix
-        self.m = []
-        for i in range(len(self.clocks)):
-            self.m.append([])
-            for j in range(len(self.clocks)):
-                if j == 0 and i != 0:
-                    self.m[i].append(Bound.unbounded())
-                else:
-                    self.m[i].append(Bound.leq(0))
+        self.raw = array("q", [LE_ZERO]) * (self.dim * self.dim)
+        for i in range(1, self.dim):
+            self.raw[i * self.dim] = INF
 
         self.__is_canonical = True
 
+    @classmethod
+    def from_raw(
+        cls, clocks: List[str], raw: "array[int]", is_canonical: bool = False
+    ) -> "DBM":
+        """Creates a DBM directly from a flat matrix in raw representation
+
+        Args:
+            clocks (List[str]): names of the clocks
+            raw (array[int]): flat matrix of bounds in raw representation
+            is_canonical (bool): whether the matrix is known to be canonical
+        """
+        d = cls(clocks)
+        DBM.__init_raw(d, d.clocks, raw, is_canonical)
+        return d
+
+    @classmethod
+    def from_clock_index(
+        cls, clocks: Dict[str, int], raw: "array[int]", is_canonical: bool = False
+    ) -> "DBM":
+        """Creates a DBM from a flat matrix in raw representation for the clock
+        index of an existing DBM, i.e. its `clocks` attribute. The index is
+        shared as it is never modified.
+
+        Args:
+            clocks (Dict[str, int]): clock index of an existing DBM
+            raw (array[int]): flat matrix of bounds in raw representation
+            is_canonical (bool): whether the matrix is known to be canonical
+        """
+        d = cls.__new__(cls)
+        DBM.__init_raw(d, clocks, raw, is_canonical)
+        return d
+
+    def __init_raw(
+        self, clocks: Dict[str, int], raw: "array[int]", is_canonical: bool
+    ) -> None:
+        """Initializes all attributes for a clock index and a flat matrix, used
+        by the alternate constructors instead of `__init__`
+        """
+        self.clocks = clocks
+        self.dim = len(clocks)
+        assert len(raw) == self.dim * self.dim
+        self.raw = raw
+        self.__is_empty = False
+        self.__hash = None
+        self.__is_shared = False
+        self.__is_canonical = is_canonical
+        self.__touched = None
+
+    def copy(self: T) -> T:
+        """Copies the DBM. The matrix is shared with the copy until one of
+        them is modified, the clock index is shared as it is never modified.
+        """
+        # the copy takes over all attributes, including the shared flag
+        self.__is_shared = True
+        d = self.__class__.__new__(self.__class__)
+        d.__dict__.update(self.__dict__)
+        return d
+
+    def __deepcopy__(self: T, memo) -> T:
+        d = self.copy()
+        memo[id(self)] = d
+        return d
+
+    def get_writable_raw(self) -> "array[int]":
+        """Returns the matrix for modification, if it is shared with a copy
+        of the DBM it is copied first. Call `mark_modified` after modifying
+        entries unless the DBM stays canonical.
+        """
+        self.__hash = None
+        if self.__is_shared:
+            self.raw = array("q", self.raw)
+            self.__is_shared = False
+        return self.raw
+
+    @property
+    def m(self) -> List[List["Bound"]]:
+        """The matrix of the DBM as `Bound` objects"""
+        dim = self.dim
+        return [
+            [Bound.from_raw(b) for b in self.raw[i * dim : (i + 1) * dim]]
+            for i in range(dim)
+        ]
+
     def __str__(self) -> str:
         s = "[\n"
+        m = self.m
         for i in range(len(self.clocks)):
             s += "["
             for j in range(len(self.clocks)):
-                s += str(self.m[i][j]) + "\t"
+                s += str(m[i][j]) + "\t"
             s += "]\n"
         s += "]"
         return s
@@ -84,7 +266,16 @@ class DBM:
         self.canonicalize()
         other.canonicalize()
 
-        return self.m == other.m
+        return self.raw == other.raw
+
+    def __hash__(self) -> int:
+        """Hash of the canonical form, consistent with __eq__. The hash is
+        cached until the DBM is modified.
+        """
+        if self.__hash is None:
+            self.canonicalize()
+            self.__hash = hash(self.raw.tobytes())
+        return self.__hash
 
     def __get_clock_names(self) -> List[str]:
         """Get the names of clocks excluding the 0 clock"""
@@ -96,32 +287,11 @@ class DBM:
         """Check if constraints in the DBM are satisfiable or if the set of
         clock valuations that satisfy this DBM is empty
         """
-
-        # Check for negative self-loops indicating a negative loop.
-        # For self loops to be negative, the DBM has to be in the
-        # canonical form.
-        # See https://www.seas.upenn.edu/~lee/09cis480/papers/by-lncs04.pdf
+        # Emptiness is detected whenever the DBM is closed, either by
+        # `floyd_warshall` or incrementally in `and_constr`. Hence, a DBM in
+        # canonical form is empty iff it has been marked as empty.
         assert self.__is_canonical
-
-        if self.__is_empty:
-            return False
-
-        for i in range(len(self.m)):
-            for j in range(len(self.m)):
-                if (i == j) and (self.m[i][i].get_value() < 0):
-                    self.__is_empty = True
-                    return False
-                elif j < i:
-                    if self.m[i][j] < -self.m[j][i]:
-                        self.__is_empty = True
-                        return False
-                    # Check whether both are strictly less bounds and therefore
-                    # contradicting
-                    elif self.m[i][j] == -self.m[j][i]:
-                        if self.m[i][j].ty == BoundType.LESS:
-                            self.__is_empty = True
-                            return False
-        return True
+        return not self.__is_empty
 
     def canonicalize(self) -> bool:
         """Canonicalize the DBM by tightening all constraints and
@@ -135,32 +305,119 @@ class DBM:
             return False
 
         if not self.__is_canonical:
-            self.m = floyd_warshall(self.m)
+            # only the touched clocks are needed as pivots if the DBM has
+            # only been tightened, a canonical DBM without tightened entries
+            # is left as is and may still share its matrix
+            if self.__touched != frozenset() and not self.close_matrix(
+                self.get_writable_raw(), self.dim, 0, self.__touched
+            ):
+                self.__is_empty = True
+                return False
             self.__is_canonical = True
+            self.__touched = None
 
         return self.__check_constraints_satisfiable()
 
+    def is_included_in(self, other: "DBM") -> bool:
+        """Checks whether all clock valuations satisfying this DBM also
+        satisfy `other`.
+
+        Returns:
+            True if this DBM is a subset of `other`
+        """
+        assert self.clocks == other.clocks
+
+        # The empty DBM is included in all DBMs
+        if not self.canonicalize():
+            return True
+
+        # For a canonical DBM it suffices to compare the entries, `other` does
+        # not need to be canonical
+        for a, b in zip(self.raw, other.raw):
+            if a > b:
+                return False
+        return True
+
+    def mark_modified(self) -> None:
+        """Marks the DBM as no longer canonical. This has to be called after
+        entries of `raw` have been modified directly, the next
+        canonicalization closes the whole matrix.
+        """
+        self.__is_canonical = False
+        self.__touched = None
+        self.__hash = None
+
     def is_not_empty(self) -> bool:
         """Checks whether there are clock evaluations that can satisfy a DBM"""
         return self.canonicalize()
 
     def reset(self, clocks: List[str]) -> None:
-        """Resets all given clocks to 0"""
-        if not self.__is_canonical:
-            self.canonicalize()
+        """Resets all given clocks to 0. A canonical DBM stays canonical."""
+        if not self.canonicalize() or not clocks:
+            return
 
+        raw = self.get_writable_raw()
+        dim = self.dim
         for clock in clocks:
             c = self.clocks[clock]
-            for i in range(len(self.m)):
-                self.m[c][i] = self.m[0][i]
-                self.m[i][c] = self.m[i][0]
-            self.m[0][c] = Bound.leq(0)
-            self.m[c][0] = Bound.leq(0)
+            # row c becomes a copy of row 0 and column c of column 0
+            raw[c * dim : (c + 1) * dim] = raw[0:dim]
+            raw[c::dim] = raw[0::dim]
+            raw[c] = LE_ZERO
+            raw[c * dim] = LE_ZERO
 
     def delay(self) -> None:
-        """Delays all clocks by setting their upper bound to infinity."""
-        for i in range(1, len(self.m)):
-            self.m[i][0] = Bound.unbounded()
+        """Delays all clocks by setting their upper bound to infinity. A
+        canonical DBM stays canonical.
+        """
+        # Removing upper bounds is only exact for DBMs in canonical form
+        if not self.canonicalize():
+            return
+
+        raw = self.raw
+        dim = self.dim
+        if all(raw[i] == INF for i in range(dim, len(raw), dim)):
+            return
+
+        raw = self.get_writable_raw()
+        for i in range(dim, len(raw), dim):
+            raw[i] = INF
+
+    def down(self) -> None:
+        """Computes the past of the DBM, i.e. all clock valuations from which
+        a valuation of the DBM can be reached by delaying. A canonical DBM
+        stays canonical.
+        """
+        if not self.canonicalize():
+            return
+
+        raw = self.get_writable_raw()
+        dim = self.dim
+        for j in range(1, dim):
+            # the lower bound of clock j is bounded by its differences to the
+            # other clocks as all clocks decrease at the same rate
+            b = LE_ZERO
+            for k in range(1, dim):
+                if raw[k * dim + j] < b:
+                    b = raw[k * dim + j]
+            raw[j] = b
+
+    def free(self, clocks: List[str]) -> None:
+        """Removes all constraints on the given clocks, i.e. they can take
+        arbitrary values. A canonical DBM stays canonical.
+        """
+        if not self.canonicalize() or not clocks:
+            return
+
+        raw = self.get_writable_raw()
+        dim = self.dim
+        for clock in clocks:
+            c = self.clocks[clock]
+            for i in range(dim):
+                if i != c:
+                    raw[c * dim + i] = INF
+                    # c - i < ∞ and i - c ≤ i - 0 as c ≥ 0
+                    raw[i * dim + c] = raw[i * dim]
 
     def intersect(self, other: "DBM") -> "DBM":
         """Computes the intersection between two DBMs"""
@@ -171,41 +428,76 @@ class DBM:
         self.canonicalize()
         other.canonicalize()
 
-        m = []
+        raw = array("q", map(min, self.raw, other.raw))
+
+        return DBM.from_raw(self.__get_clock_names(), raw)
+
+    def convex_hull(self: T, other: T) -> T:
+        """Computes the smallest DBM containing this DBM and `other`, the
+        result is canonical
+        """
+        assert self.clocks == other.clocks
 
-        for i in range(len(self.m)):
-            tmp = []
-            for j in range(len(self.m[i])):
-                if self.m[i][j] <= other.m[i][j]:
-                    b = self.m[i][j]
-                else:
-                    b = other.m[i][j]
-                tmp.append(copy.deepcopy(b))
-            m.append(tmp)
+        if not self.canonicalize():
+            return other.copy()
+        if not other.canonicalize():
+            return self.copy()
 
-        return DBM(self.__get_clock_names(), m)
+        # the maximum of two canonical DBMs is canonical
+        raw = array("q", map(max, self.raw, other.raw))
+        hull = self.from_clock_index(self.clocks, raw, is_canonical=True)
+        assert isinstance(hull, self.__class__)
+        return hull
 
     def and_constr(self, constr: "Constraint") -> None:
-        """ands a constraint to the DBM"""
+        """ands a constraint to the DBM
+
+        If the DBM is in canonical form, only paths through the tightened
+        entry are closed again which keeps the DBM canonical in O(n²).
+        """
         # Defined in
         #   https://www.seas.upenn.edu/~lee/09cis480/papers/by-lncs04.pdf
+        if self.__is_empty:
+            return
+
+        dim = self.dim
         i = self.clocks[constr.get_c_1()]
         j = self.clocks[constr.get_c_2()]
+        b = constr.get_bound().to_raw()
+        raw = self.raw
 
-        if self.m[i][j] > constr.get_bound():
-            self.m[i][j] = constr.get_bound()
-            self.__is_canonical = False
+        if raw[i * dim + j] <= b:
+            return
 
+        raw = self.get_writable_raw()
+        raw[i * dim + j] = b
 
-def floyd_warshall(dist):
-    """Executes Floyd Warshall on the graph given in matrix form"""
-    for k in range(len(dist)):
-        # Pick all vertices as source one by one
-        for i in range(len(dist)):
-            # Pick all vertices as destination for the above picked source
-            for j in range(len(dist)):
-                # if vertex k is on the shortest path from i to j, then update
-                # the value of dist[i][j]
-                if dist[i][k] + dist[k][j] < dist[i][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
-    return dist
+        if not self.__is_canonical:
+            if self.__touched is not None:
+                self.__touched = self.__touched | {i, j}
+            return
+
+        # The new edge i -> j closes a negative cycle with j -> i
+        if raw_add(b, raw[j * dim + i]) < LE_ZERO:
+            self.__is_empty = True
+            return
+
+        self.close_matrix_edge(raw, dim, i, j)
+
+    def and_constrs(self, constrs: List["Constraint"]) -> None:
+        """ands several constraints to the DBM
+
+        For a DBM in canonical form, the constraints are added without closing
+        the DBM in between. The DBM is closed once afterwards with only the
+        constrained clocks as pivots.
+        """
+        if len(constrs) <= 1 or not self.__is_canonical:
+            for constr in constrs:
+                self.and_constr(constr)
+            return
+
+        self.__is_canonical = False
+        self.__touched = frozenset()
+        for constr in constrs:
+            self.and_constr(constr)
+        self.canonicalize()
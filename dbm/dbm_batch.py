@@ -0,0 +1,208 @@
+""" This file contains a container for operating on many DBMs over the same
+    clocks at once.
+
+    All matrices are stored in a single flat buffer of shape
+    (zones, dim, dim) in row-major order, i.e. entry (i, j) of zone z is
+    located at `raw[z * dim * dim + i * dim + j]`. Each operation processes
+    all zones in one pass over the buffer instead of going through the
+    per-zone `DBM` methods.
+"""
+
+from array import array
+from typing import List, Mapping, Sequence
+
+from dbm.bound import INF, LE_ZERO, raw_add, raw_le
+from dbm.constraint import Constraint
+from dbm.dbm import DBM
+from dbm.dbm_global import (
+    DELTA,
+    extrapolate_raw,
+    extrapolate_lu_raw,
+    get_lu_thresholds,
+)
+
+
+class DBMBatch:
+    """DBMBatch holds a sequence of DBMs with the same clocks and applies the
+    DBM operations to all of them at once. Zones that become empty are
+    excluded from all further operations.
+
+    Attributes:
+        clocks (Dict[str, int]): the clock index shared by all zones
+        dim (int): dimension of a single matrix
+        raw (array[int]): flat buffer of all matrices
+        empty (List[bool]): whether a zone is known to be empty
+    """
+
+    def __init__(self, zones: Sequence["DBM"]) -> None:
+        """Copies the given zones into a batch, the zones are canonicalized.
+
+        Args:
+            zones (Sequence["DBM"]): zones with the same clocks and type
+        """
+        assert len(zones) > 0
+        self.__cls = type(zones[0])
+        self.clocks = zones[0].clocks
+        self.dim = len(self.clocks)
+        self.raw = array("q")
+        self.empty: List[bool] = []
+        # whether a zone might not be canonical
+        self.__dirty: List[bool] = []
+
+        for zone in zones:
+            assert zone.clocks == self.clocks
+            self.empty.append(not zone.canonicalize())
+            self.__dirty.append(False)
+            self.raw.extend(zone.raw)
+
+    def __len__(self) -> int:
+        return len(self.empty)
+
+    def __bases(self) -> List[int]:
+        """Returns the offsets of all non-empty zones"""
+        size = self.dim * self.dim
+        return [z * size for z in range(len(self.empty)) if not self.empty[z]]
+
+    def __set_empty(self, base: int) -> None:
+        """Marks the zone at the given offset as empty"""
+        self.empty[base // (self.dim * self.dim)] = True
+        # a negative self loop makes the zone empty when it is extracted
+        self.raw[base] = raw_le(0)
+
+    def and_constr(self, constr: "Constraint") -> None:
+        """ands a constraint to all zones, canonical zones are closed
+        incrementally (see `DBM.and_constr`)
+        """
+        raw = self.raw
+        dim = self.dim
+        i = self.clocks[constr.get_c_1()]
+        j = self.clocks[constr.get_c_2()]
+        b = constr.get_bound().to_raw()
+        size = dim * dim
+
+        for base in self.__bases():
+            if raw[base + i * dim + j] <= b:
+                continue
+            raw[base + i * dim + j] = b
+
+            if self.__dirty[base // size]:
+                continue
+
+            # The new edge i -> j closes a negative cycle with j -> i
+            if raw_add(b, raw[base + j * dim + i]) < LE_ZERO:
+                self.__set_empty(base)
+                continue
+
+            self.__cls.close_matrix_edge(raw, dim, i, j, base)
+
+    def canonicalize(self) -> None:
+        """Canonicalizes all zones that are not in canonical form and detects
+        emptiness
+        """
+        raw = self.raw
+        dim = self.dim
+        size = dim * dim
+
+        for base in self.__bases():
+            if not self.__dirty[base // size]:
+                continue
+            if not self.__cls.close_matrix(raw, dim, base):
+                self.__set_empty(base)
+            self.__dirty[base // size] = False
+
+    def reset(self, clocks: List[str]) -> None:
+        """Resets the given clocks to 0 in all zones, canonical zones stay
+        canonical
+        """
+        if not clocks:
+            return
+
+        self.canonicalize()
+        raw = self.raw
+        dim = self.dim
+        for base in self.__bases():
+            end = base + dim * dim
+            for clock in clocks:
+                c = self.clocks[clock]
+                # row c becomes a copy of row 0 and column c of column 0
+                raw[base + c * dim : base + (c + 1) * dim] = raw[base : base + dim]
+                raw[base + c : end : dim] = raw[base:end:dim]
+                raw[base + c] = LE_ZERO
+                raw[base + c * dim] = LE_ZERO
+
+    def delay(self) -> None:
+        """Removes the upper bounds of all clocks in all zones, canonical zones
+        stay canonical
+        """
+        self.canonicalize()
+        raw = self.raw
+        dim = self.dim
+        for base in self.__bases():
+            for i in range(base + dim, base + dim * dim, dim):
+                raw[i] = INF
+
+    def free(self, clocks: List[str]) -> None:
+        """Removes all constraints on the given clocks in all zones, canonical
+        zones stay canonical (see `DBM.free`)
+        """
+        if not clocks:
+            return
+
+        self.canonicalize()
+        raw = self.raw
+        dim = self.dim
+        for base in self.__bases():
+            for clock in clocks:
+                c = self.clocks[clock]
+                for i in range(dim):
+                    if i != c:
+                        raw[base + c * dim + i] = INF
+                        raw[base + i * dim + c] = raw[base + i * dim]
+
+    def extrapolate(self, max_clock: int, max_delta: int) -> None:
+        """Extrapolates all zones as described in `DBMG.extrapolate`, all zones
+        need the global clock
+        """
+        delta_ind = self.clocks[DELTA]
+        size = self.dim * self.dim
+        for base in self.__bases():
+            updates = extrapolate_raw(
+                self.raw, self.dim, delta_ind, max_clock, max_delta, base=base
+            )
+            for ij, b in updates:
+                self.raw[ij] = b
+            if updates:
+                self.__dirty[base // size] = True
+
+    def extrapolate_lu(
+        self, lower: Mapping[str, float], upper: Mapping[str, float]
+    ) -> None:
+        """Extrapolates all zones with lower and upper bound constants per
+        clock as described in `DBMG.extrapolate_lu`
+        """
+        self.canonicalize()
+        thresholds = get_lu_thresholds(self.clocks, lower, upper)
+        size = self.dim * self.dim
+        for base in self.__bases():
+            updates = extrapolate_lu_raw(self.raw, self.dim, thresholds, base=base)
+            for ij, b in updates:
+                self.raw[ij] = b
+            if updates:
+                self.__dirty[base // size] = True
+
+    def get_zones(self) -> List["DBM"]:
+        """Returns the zones of the batch as DBMs of the type the batch has
+        been created from, empty zones are included
+        """
+        size = self.dim * self.dim
+        zones = []
+        for z in range(len(self.empty)):
+            raw = self.raw[z * size : (z + 1) * size]
+            zones.append(
+                self.__cls.from_clock_index(
+                    self.clocks,
+                    raw,
+                    is_canonical=not (self.empty[z] or self.__dirty[z]),
+                )
+            )
+        return zones
@@ -0,0 +1,163 @@
+""" This file contains a compact representation of DBMs for zones that are
+    only stored and not operated on.
+
+    Instead of the full matrix, only the minimal set of non-redundant
+    constraints of the canonical DBM (the reduced constraint graph) is kept.
+    All other entries are implied by them and are restored by closing the
+    graph again. The reduction is described in
+
+        K. G. Larsen, F. Larsson, P. Pettersson, W. Yi: Efficient Verification
+        of Real-Time Systems: Compact Data Structure and State-Space
+        Reduction, RTSS 1997
+"""
+
+from array import array
+from typing import Dict, List
+
+from dbm.bound import INF, LE_ZERO, raw_add, raw_le
+from dbm.dbm import DBM
+
+
+class CompactDBM:
+    """CompactDBM stores a DBM as its minimal set of constraints. Two
+    CompactDBMs are equal iff the DBMs they were created from are equal.
+
+    Attributes:
+        clocks (Dict[str, int]): the clock index of the original DBM
+        edges (array[int]): the minimal constraints as flat triples
+            (i, j, raw bound) of clock indices and bounds in raw
+            representation
+    """
+
+    def __init__(self, dbm: "DBM") -> None:
+        """Creates the compact representation of a DBM
+
+        Args:
+            dbm ("DBM"): the DBM to store
+        """
+        self.__cls = type(dbm)
+        self.clocks: Dict[str, int] = dbm.clocks
+        self.edges = minimal_constraints(dbm)
+
+    def __str__(self) -> str:
+        return f"CompactDBM{self.get_constraints()}"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactDBM):
+            return False
+        return self.clocks == other.clocks and self.edges == other.edges
+
+    def __hash__(self) -> int:
+        return hash(self.edges.tobytes())
+
+    def get_constraints(self) -> List[tuple]:
+        """Returns the stored constraints as (i, j, raw bound) triples"""
+        e = self.edges
+        return [(e[k], e[k + 1], e[k + 2]) for k in range(0, len(e), 3)]
+
+    def expand(self) -> "DBM":
+        """Restores the canonical DBM, the DBM has the type of the DBM this
+        object has been created from
+
+        Returns:
+            a new DBM in canonical form
+        """
+        dim = len(self.clocks)
+        raw = array("q", [INF]) * (dim * dim)
+        for i in range(dim):
+            raw[i * dim + i] = LE_ZERO
+
+        e = self.edges
+        for k in range(0, len(e), 3):
+            raw[e[k] * dim + e[k + 1]] = e[k + 2]
+
+        d = self.__cls.from_clock_index(self.clocks, raw)
+        d.canonicalize()
+        return d
+
+    def includes(self, dbm: "DBM") -> bool:
+        """Checks whether the given DBM is included in the stored DBM. It
+        suffices to check the minimal constraints.
+
+        Args:
+            dbm ("DBM"): DBM with the same clocks
+
+        Returns:
+            True if `dbm` is a subset of the stored DBM
+        """
+        assert self.clocks == dbm.clocks
+
+        if not dbm.canonicalize():
+            return True
+
+        raw = dbm.raw
+        dim = dbm.dim
+        e = self.edges
+        for k in range(0, len(e), 3):
+            if raw[e[k] * dim + e[k + 1]] > e[k + 2]:
+                return False
+        return True
+
+
+def minimal_constraints(dbm: "DBM") -> "array[int]":
+    """Computes the minimal set of constraints of a DBM whose closure is the
+    canonical form of the DBM
+
+    Args:
+        dbm ("DBM"): the DBM to reduce
+
+    Returns:
+        flat triples (i, j, raw bound) of the minimal constraints
+    """
+    # an empty DBM is represented by a negative self loop
+    if not dbm.canonicalize():
+        return array("q", [0, 0, raw_le(0)])
+
+    raw = dbm.raw
+    dim = dbm.dim
+    edges = array("q")
+
+    # Clocks on a cycle of weight ≤ 0 have a fixed difference and form an
+    # equivalence class, the smallest clock of a class represents it
+    rep = list(range(dim))
+    for i in range(dim):
+        for j in range(i):
+            if rep[j] == j and raw_add(raw[i * dim + j], raw[j * dim + i]) == LE_ZERO:
+                rep[i] = j
+                break
+
+    # connect the clocks of a class by a single cycle
+    last: Dict[int, int] = {}
+    for i in range(dim):
+        r = rep[i]
+        if r == i:
+            last[i] = i
+        else:
+            edges.extend((last[r], i, raw[last[r] * dim + i]))
+            last[r] = i
+    for r, l in last.items():
+        if l != r:
+            edges.extend((l, r, raw[l * dim + r]))
+
+    # between representatives, an edge is redundant if it is implied by a
+    # path over another representative
+    reps = [i for i in range(dim) if rep[i] == i]
+    for i in reps:
+        for j in reps:
+            d_ij = raw[i * dim + j]
+            if i == j or d_ij == INF:
+                continue
+            redundant = False
+            for k in reps:
+                if k in (i, j):
+                    continue
+                if raw_add(raw[i * dim + k], raw[k * dim + j]) <= d_ij:
+                    redundant = True
+                    break
+            if not redundant:
+                edges.extend((i, j, d_ij))
+
+    return edges
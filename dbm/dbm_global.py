@@ -6,18 +6,34 @@
     much global time has passed.
 """
 
-import copy
+import math
 
-from typing import List, Optional
+from array import array
+from enum import Enum
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 from dbm.dbm import DBM, ZERO
-from dbm.bound import Bound
+from dbm.bound import Bound, INF, LE_ZERO, raw_le
 from dbm.constraint import Constraint
 
 # Name of the global clock
 DELTA = "delta"
 
 
+class Extrapolation(Enum):
+    """Abstraction applied to zones during exploration"""
+
+    # one maximal constant for all regular clocks and one for the global clock
+    M = "m"
+    # lower and upper bound constants per clock (Extra⁺_LU)
+    LU = "lu"
+    # one constant per clock and location (Extra⁺_M with local constants)
+    LOCAL_M = "local_m"
+    # lower and upper bound constants per clock and location
+    LOCAL_LU = "local_lu"
+
+
 class DBMG(DBM):
     """DBMGlobal is a special for of a DBM with an additional global clock
     named as defined in the constant DELTA intended to track the global time
@@ -52,20 +68,45 @@ class DBMG(DBM):
             max_delta (int): maximal clock valuation of clock constraints on
                 the global clock
         """
-        delta_ind = self.clocks[DELTA]
-
-        for i in range(len(self.m)):
-            for j in range(len(self.m)):
-                if delta_ind not in (i, j):
-                    if self.m[i][j].get_value() > max_clock:
-                        self.m[i][j] = Bound.unbounded()
-                    if self.m[i][j].get_value() < -max_clock:
-                        self.m[i][j] = Bound.le(-max_clock)
-                else:
-                    if self.m[i][j].get_value() > max_delta:
-                        self.m[i][j] = Bound.unbounded()
-                    if self.m[i][j].get_value() < -max_delta:
-                        self.m[i][j] = Bound.le(-max_delta)
+        updates = extrapolate_raw(
+            self.raw, self.dim, self.clocks[DELTA], max_clock, max_delta
+        )
+        if updates:
+            # a matrix shared with a copy is only copied if it changes
+            raw = self.get_writable_raw()
+            for ij, b in updates:
+                raw[ij] = b
+            self.mark_modified()
+
+    def extrapolate_lu(
+        self, lower: Mapping[str, float], upper: Mapping[str, float]
+    ) -> None:
+        """Extrapolates the DBM with lower and upper bound constants per clock
+        (Extra⁺_LU), see
+            G. Behrmann, P. Bouyer, K. G. Larsen, R. Pelánek: Lower and upper
+            bounds in zone-based abstractions of timed automata, STTT 2006
+
+        `lower[c]` is the largest constant c is compared against in a lower
+        bound (c > n, c ≥ n), `upper[c]` the largest one in an upper bound
+        (c < n, c ≤ n). Clocks that are missing are never compared, i.e. their
+        constants are -inf. The abstraction is only exact for diagonal free
+        guards.
+
+        Args:
+            lower (Mapping[str, float]): L constant per clock
+            upper (Mapping[str, float]): U constant per clock
+        """
+        if not self.canonicalize():
+            return
+
+        updates = extrapolate_lu_raw(
+            self.raw, self.dim, get_lu_thresholds(self.clocks, lower, upper)
+        )
+        if updates:
+            raw = self.get_writable_raw()
+            for ij, b in updates:
+                raw[ij] = b
+            self.mark_modified()
 
     def __lt__(self, other: "DBMG") -> bool:
         """< is defined on the lower bound of the global clock value"""
@@ -76,28 +117,35 @@ class DBMG(DBM):
 
     def get_dbm(self) -> "DBM":
         """Returns a copy of the inner dbm without the global clock"""
-        m = copy.deepcopy(self.m)
-        for l in m:
-            del l[self.clocks[DELTA]]
-        del m[self.clocks[DELTA]]
+        ind_delta = self.clocks[DELTA]
+        dim = self.dim
+        raw = array(
+            "q",
+            (
+                self.raw[i * dim + j]
+                for i in range(dim)
+                for j in range(dim)
+                if ind_delta not in (i, j)
+            ),
+        )
 
         clocks = list(self.clocks.keys())
         clocks.remove(DELTA)
         clocks.remove(ZERO)
 
-        return DBM(clocks, m)
+        return DBM.from_raw(clocks, raw)
 
     def get_min_bound_on_clock(self, clock: str) -> "Bound":
         self.canonicalize()
         ind_clock = self.clocks[clock]
         ind_0 = self.clocks[ZERO]
-        return self.m[ind_0][ind_clock]
+        return Bound.from_raw(self.raw[ind_0 * self.dim + ind_clock])
 
     def get_max_bound_on_clock(self, clock: str) -> "Bound":
         self.canonicalize()
         ind_clock = self.clocks[clock]
         ind_0 = self.clocks[ZERO]
-        return self.m[ind_clock][ind_0]
+        return Bound.from_raw(self.raw[ind_clock * self.dim + ind_0])
 
     def get_min_global(self) -> "Constraint":
         """Returns a constraint representing the lower bound on the global time
@@ -110,7 +158,7 @@ class DBMG(DBM):
         self.canonicalize()
         ind_delta = self.clocks[DELTA]
         ind_0 = self.clocks[ZERO]
-        return self.m[ind_0][ind_delta]
+        return Bound.from_raw(self.raw[ind_0 * self.dim + ind_delta])
 
     def get_max_global(self) -> "Constraint":
         """Returns a constraint representing the upper bound on the global time
@@ -123,4 +171,279 @@ class DBMG(DBM):
         self.canonicalize()
         ind_delta = self.clocks[DELTA]
         ind_0 = self.clocks[ZERO]
-        return self.m[ind_delta][ind_0]
+        return Bound.from_raw(self.raw[ind_delta * self.dim + ind_0])
+
+
+def floyd_warshall_3(
+    dist: "array[int]",
+    n: int = 3,
+    base: int = 0,
+    pivots: Optional[Iterable[int]] = None,  # pylint: disable=unused-argument
+) -> bool:
+    """Executes Floyd Warshall on a flat 3 x 3 matrix with the loops and the
+    addition of bounds unrolled, see `dbm.dbm.floyd_warshall`. For this size
+    all vertices are used as pivots, `pivots` is only accepted as part of the
+    signature of `DBM.close_matrix` and ignored.
+
+    Returns:
+        False if the graph has a negative cycle, i.e. the DBM is empty
+    """
+    assert n == 3
+    m00, m01, m02, m10, m11, m12, m20, m21, m22 = dist[base : base + 9]
+
+    # paths over 0
+    if m10 != INF:
+        if m01 != INF:
+            d = m10 + m01 - ((m10 | m01) & 1)
+            m11 = min(m11, d)
+        if m02 != INF:
+            d = m10 + m02 - ((m10 | m02) & 1)
+            m12 = min(m12, d)
+    if m20 != INF:
+        if m01 != INF:
+            d = m20 + m01 - ((m20 | m01) & 1)
+            m21 = min(m21, d)
+        if m02 != INF:
+            d = m20 + m02 - ((m20 | m02) & 1)
+            m22 = min(m22, d)
+    if m11 < LE_ZERO or m22 < LE_ZERO:
+        return False
+
+    # paths over 1
+    if m01 != INF:
+        if m10 != INF:
+            d = m01 + m10 - ((m01 | m10) & 1)
+            m00 = min(m00, d)
+        if m12 != INF:
+            d = m01 + m12 - ((m01 | m12) & 1)
+            m02 = min(m02, d)
+    if m21 != INF:
+        if m10 != INF:
+            d = m21 + m10 - ((m21 | m10) & 1)
+            m20 = min(m20, d)
+        if m12 != INF:
+            d = m21 + m12 - ((m21 | m12) & 1)
+            m22 = min(m22, d)
+    if m00 < LE_ZERO or m22 < LE_ZERO:
+        return False
+
+    # paths over 2
+    if m02 != INF:
+        if m20 != INF:
+            d = m02 + m20 - ((m02 | m20) & 1)
+            m00 = min(m00, d)
+        if m21 != INF:
+            d = m02 + m21 - ((m02 | m21) & 1)
+            m01 = min(m01, d)
+    if m12 != INF:
+        if m20 != INF:
+            d = m12 + m20 - ((m12 | m20) & 1)
+            m10 = min(m10, d)
+        if m21 != INF:
+            d = m12 + m21 - ((m12 | m21) & 1)
+            m11 = min(m11, d)
+    if m00 < LE_ZERO or m11 < LE_ZERO:
+        return False
+
+    dist[base : base + 9] = array("q", (m00, m01, m02, m10, m11, m12, m20, m21, m22))
+    return True
+
+
+def close_edge_3(
+    dist: "array[int]",
+    n: int,
+    i: int,  # pylint: disable=unused-argument
+    j: int,  # pylint: disable=unused-argument
+    base: int = 0,
+) -> "array[int]":
+    """Restores the canonical form of a flat 3 x 3 matrix after the entry
+    (i, j) has been tightened, see `dbm.dbm.close_edge`. For this size the
+    unrolled full closure is as cheap as closing over the single edge, `i`
+    and `j` are only accepted as part of the signature of
+    `DBM.close_matrix_edge`.
+    """
+    floyd_warshall_3(dist, n, base)
+    return dist
+
+
+class SingleClockDBMG(DBMG):
+    """SingleClockDBMG is a DBMG over a single regular clock, i.e. a fixed
+    3 x 3 matrix over the zero clock, the clock and the global clock (in this
+    order). Closure, emptiness detection, reset and delay are unrolled for
+    this size.
+    """
+
+    close_matrix = staticmethod(floyd_warshall_3)
+    close_matrix_edge = staticmethod(close_edge_3)
+
+    def __init__(
+        self, clocks: List[str], m: Optional[List[List["Bound"]]] = None
+    ) -> None:
+        assert len(clocks) == 1
+        super().__init__(clocks, m)
+
+    def reset(self, clocks: List[str]) -> None:
+        """Resets all given clocks to 0. A canonical DBM stays canonical."""
+        if clocks != [self.get_clock()]:
+            super().reset(clocks)
+            return
+
+        if not self.canonicalize():
+            return
+
+        raw = self.get_writable_raw()
+        # row 1 becomes a copy of row 0 and column 1 of column 0
+        raw[1] = LE_ZERO
+        raw[3] = LE_ZERO
+        raw[4] = LE_ZERO
+        raw[5] = raw[2]
+        raw[7] = raw[6]
+
+    def delay(self) -> None:
+        """Delays all clocks by setting their upper bound to infinity. A
+        canonical DBM stays canonical.
+        """
+        if not self.canonicalize():
+            return
+
+        if self.raw[3] == INF and self.raw[6] == INF:
+            return
+
+        raw = self.get_writable_raw()
+        raw[3] = INF
+        raw[6] = INF
+
+    def get_clock(self) -> str:
+        """Returns the name of the regular clock"""
+        for clock, i in self.clocks.items():
+            if i == 1:
+                return clock
+        raise KeyError("no regular clock")
+
+
+def new_dbmg(clocks: List[str]) -> "DBMG":
+    """Creates a DBMG over the given clocks, uses the specialized
+    `SingleClockDBMG` if there is only a single clock
+
+    Args:
+        clocks (List[str]): names of the clocks without the global clock
+    """
+    if len(clocks) == 1:
+        return SingleClockDBMG(clocks)
+    return DBMG(clocks)
+
+
+def extrapolate_raw(
+    raw: "array[int]",
+    dim: int,
+    delta_ind: int,
+    max_clock: int,
+    max_delta: int,
+    *,
+    base: int = 0,
+) -> List[Tuple[int, int]]:
+    """Extrapolates a flat dim x dim matrix in raw representation starting at
+    index `base` as described in `DBMG.extrapolate`, the global clock has index
+    `delta_ind`. The matrix itself is not modified.
+
+    Returns:
+        the entries to change as pairs of index and new raw bound
+    """
+    # Raw representation of the extrapolation thresholds: the value of a
+    # bound is larger than c iff its raw representation is at least
+    # raw_le(c + 1) and smaller than -c iff it is below raw_le(-c). An
+    # infinite constant disables the extrapolation.
+    if max_clock == math.inf:
+        upper_clock, lower_clock = INF, -INF
+    else:
+        upper_clock, lower_clock = raw_le(max_clock + 1), raw_le(-max_clock)
+    if max_delta == math.inf:
+        upper_delta, lower_delta = INF, -INF
+    else:
+        upper_delta, lower_delta = raw_le(max_delta + 1), raw_le(-max_delta)
+
+    updates = []
+    for i in range(dim):
+        for j in range(dim):
+            if delta_ind not in (i, j):
+                upper, lower = upper_clock, lower_clock
+            else:
+                upper, lower = upper_delta, lower_delta
+            ij = base + i * dim + j
+            b = raw[ij]
+            if b >= upper and b != INF:
+                updates.append((ij, INF))
+            elif b < lower:
+                updates.append((ij, lower))
+    return updates
+
+
+# thresholds of Extra⁺_LU in raw representation per clock index, see
+# `get_lu_thresholds`
+LUThresholds = Tuple[List[int], List[int], List[int], List[int]]
+
+
+def get_lu_thresholds(
+    clocks: Dict[str, int], lower: Mapping[str, float], upper: Mapping[str, float]
+) -> "LUThresholds":
+    """Translates L and U constants per clock name (see `DBMG.extrapolate_lu`)
+    into thresholds in raw representation per clock index:
+        - a bound b is larger than L(x_i) iff b ≥ above_l[i]
+        - -b is larger than L(x_i) iff b < below_l[i]
+        - -b is larger than U(x_j) iff b < below_u[j]
+        - the relaxed lower bound < -U(x_j) is relaxed_u[j]
+    The zero clock is never extrapolated.
+    """
+    dim = len(clocks)
+    above_l = [0] * dim
+    below_l = [0] * dim
+    below_u = [0] * dim
+    relaxed_u = [0] * dim
+    for name, i in clocks.items():
+        l = lower.get(name, -math.inf) if i != 0 else 0
+        u = upper.get(name, -math.inf) if i != 0 else 0
+        if l == -math.inf:
+            above_l[i], below_l[i] = -INF, INF + 1
+        elif l == math.inf:
+            above_l[i], below_l[i] = INF + 1, -INF
+        else:
+            above_l[i], below_l[i] = raw_le(int(l) + 1), raw_le(-int(l))
+        if u == -math.inf:
+            below_u[i], relaxed_u[i] = INF + 1, LE_ZERO
+        elif u == math.inf:
+            below_u[i], relaxed_u[i] = -INF, LE_ZERO
+        else:
+            below_u[i], relaxed_u[i] = raw_le(-int(u)), raw_le(-int(u))
+    return (above_l, below_l, below_u, relaxed_u)
+
+
+def extrapolate_lu_raw(
+    raw: "array[int]", dim: int, thresholds: "LUThresholds", *, base: int = 0
+) -> List[Tuple[int, int]]:
+    """Applies Extra⁺_LU to a flat dim x dim matrix in raw representation
+    starting at index `base`, the matrix has to be canonical. The matrix
+    itself is not modified.
+
+    Returns:
+        the entries to change as pairs of index and new raw bound
+    """
+    above_l, below_l, below_u, relaxed_u = thresholds
+    # the conditions refer to the lower bounds before extrapolation
+    row_0 = raw[base : base + dim]
+
+    updates = []
+    for i in range(dim):
+        i_off = base + i * dim
+        for j in range(dim):
+            b = raw[i_off + j]
+            if i == j or b == INF:
+                continue
+            if b >= above_l[i] or row_0[i] < below_l[i]:
+                new = INF
+            elif row_0[j] < below_u[j]:
+                new = INF if i != 0 else max(b, relaxed_u[j])
+            else:
+                continue
+            if new != b:
+                updates.append((i_off + j, new))
+    return updates
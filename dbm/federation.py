@@ -0,0 +1,158 @@
+""" This file contains federations, i.e. finite unions of DBMs over the same
+    clocks.
+
+    Zones added to a federation are merged with the zones already contained
+    whenever their union is convex (exact merge), or, optionally, all zones
+    are over-approximated by their convex hull.
+"""
+
+from enum import Enum
+from typing import Generic, Iterable, Iterator, List, Optional, TypeVar, Union, cast
+
+from dbm.bound import Bound
+from dbm.constraint import Constraint
+from dbm.dbm import DBM
+from dbm.dbm_compact import CompactDBM
+
+T = TypeVar("T", bound=DBM)
+
+
+class MergeMode(Enum):
+    """How zones added to a federation are merged"""
+
+    # keep all zones as added
+    NONE = 0
+    # drop included zones and merge zones whose union is convex
+    EXACT = 1
+    # over-approximate all zones by their convex hull
+    HULL = 2
+
+
+class Federation(Generic[T]):
+    """Federation represents a union of DBMs with the same clocks and type.
+
+    Attributes:
+        mode ("MergeMode"): how added zones are merged
+        compact (bool): whether the zones are stored by their minimal
+            constraints (see `CompactDBM`)
+    """
+
+    def __init__(
+        self,
+        zones: Iterable[T] = (),
+        mode: "MergeMode" = MergeMode.EXACT,
+        compact: bool = False,
+    ) -> None:
+        """Creates a federation from the given zones
+
+        Args:
+            zones (Iterable[T]): initial zones of the federation
+            mode ("MergeMode"): how added zones are merged
+            compact (bool): whether the zones are stored compactly
+        """
+        self.mode = mode
+        self.compact = compact
+        self.__zones: List[Union[T, "CompactDBM"]] = []
+        for zone in zones:
+            self.add(zone)
+
+    def __str__(self) -> str:
+        return "Federation" + str(list(self))
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.__zones)
+
+    def __iter__(self) -> Iterator[T]:
+        for stored in self.__zones:
+            # expanded zones have the type of the zone they were created from
+            yield cast(T, stored.expand()) if isinstance(stored, CompactDBM) else stored
+
+    def __eq__(self, other) -> bool:
+        """Two federations are equal if they consist of the same zones"""
+        if not isinstance(other, Federation):
+            return False
+        return set(self) == set(other)
+
+    def add(self, zone: T) -> None:
+        """Adds a zone to the federation, the zone is not copied. Empty zones
+        are ignored unless merging is disabled.
+
+        Args:
+            zone (T): zone to add
+        """
+        if self.mode == MergeMode.NONE:
+            self.__zones.append(self.__store(zone))
+            return
+
+        if not zone.canonicalize():
+            return
+
+        zones = list(self)
+        if self.mode == MergeMode.HULL:
+            for other in zones:
+                zone = zone.convex_hull(other)
+            self.__zones = [self.__store(zone)]
+            return
+
+        if any(zone.is_included_in(other) for other in zones):
+            return
+        zones = [other for other in zones if not other.is_included_in(zone)]
+
+        # a merged zone might be mergeable with other zones again
+        merged = True
+        while merged:
+            merged = False
+            for k, other in enumerate(zones):
+                union = convex_union(zone, other)
+                if union is not None:
+                    del zones[k]
+                    zone = union
+                    merged = True
+                    break
+
+        zones.append(zone)
+        self.__zones = [self.__store(z) for z in zones]
+
+    def includes(self, zone: T) -> bool:
+        """Checks whether the zone is included in one of the zones of the
+        federation. This is sufficient but not necessary for the zone being a
+        subset of the federation.
+        """
+        return any(zone.is_included_in(other) for other in self)
+
+    def __store(self, zone: T) -> Union[T, "CompactDBM"]:
+        if self.compact:
+            return CompactDBM(zone)
+        return zone
+
+
+def convex_union(zone_1: T, zone_2: T) -> Optional[T]:
+    """Computes the union of two zones if it is convex
+
+    Returns:
+        the union of both zones or None if the union is not convex
+    """
+    hull = zone_1.convex_hull(zone_2)
+
+    # The hull is the union iff hull \\ zone_1 is included in zone_2. The
+    # difference is covered by the hull restricted to the negation of each
+    # constraint of zone_1 that is loosened in the hull.
+    names = list(zone_1.clocks)
+    dim = zone_1.dim
+    for i in range(dim):
+        for j in range(dim):
+            b = zone_1.raw[i * dim + j]
+            if b >= hull.raw[i * dim + j]:
+                continue
+
+            # not (c_i - c_j ≤ n) is c_j - c_i < -n and vice versa, in raw
+            # representation this is 1 - b
+            piece = hull.copy()
+            piece.and_constr(Constraint(names[j], names[i], Bound.from_raw(1 - b)))
+            if piece.is_not_empty() and not piece.is_included_in(zone_2):
+                return None
+
+    return hull
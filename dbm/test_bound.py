@@ -1,8 +1,10 @@
 """ Unit tests for Bound functionality
 """
 
+import copy
+import pickle
 import unittest
-from dbm.bound import Bound
+from dbm.bound import INF, Bound, raw_add
 
 
 class TestBound(unittest.TestCase):
@@ -169,3 +171,79 @@ class TestBound(unittest.TestCase):
                 f"failed test case {tc['name']}: expected {tc['bound_1']} + \
                     {tc['bound_2']} to equal {tc['expected']}",
             )
+
+    def test_raw_roundtrip(self):
+        test_cases = [
+            Bound.leq(0),
+            Bound.le(0),
+            Bound.leq(-3),
+            Bound.le(-3),
+            Bound.leq(42),
+            Bound.unbounded(),
+        ]
+
+        for b in test_cases:
+            self.assertEqual(
+                Bound.from_raw(b.to_raw()), b, f"failed raw roundtrip of {b}"
+            )
+
+    def test_raw_order(self):
+        bounds = [
+            Bound.le(-2),
+            Bound.leq(-2),
+            Bound.le(0),
+            Bound.leq(0),
+            Bound.le(3),
+            Bound.leq(3),
+            Bound.unbounded(),
+        ]
+
+        for b_1 in bounds:
+            for b_2 in bounds:
+                if b_1.is_unbounded() and b_2.is_unbounded():
+                    continue
+                self.assertEqual(
+                    b_1.to_raw() < b_2.to_raw(),
+                    b_1 < b_2,
+                    f"failed raw order of {b_1} and {b_2}",
+                )
+
+    def test_raw_add(self):
+        bounds = [
+            Bound.le(-2),
+            Bound.leq(-2),
+            Bound.leq(0),
+            Bound.le(3),
+            Bound.leq(3),
+            Bound.unbounded(),
+        ]
+
+        for b_1 in bounds:
+            for b_2 in bounds:
+                self.assertEqual(
+                    Bound.from_raw(raw_add(b_1.to_raw(), b_2.to_raw())),
+                    b_1 + b_2,
+                    f"failed raw addition of {b_1} and {b_2}",
+                )
+
+    def test_immutable_shared(self):
+        Bound.intern(3)
+        b = Bound.leq(3)
+        self.assertIs(Bound.leq(3), b)
+        self.assertIsNot(Bound.leq(4), Bound.leq(4))
+        self.assertIs(Bound.unbounded(), Bound.from_raw(INF))
+        self.assertIs(Bound.unbounded(), Bound.unbounded())
+        self.assertIs(Bound.from_raw(b.to_raw()), b)
+        self.assertIs(copy.deepcopy(b), b)
+        self.assertIs(pickle.loads(pickle.dumps(b)), b)
+        self.assertEqual(hash(Bound.le(-2)), hash(Bound(-2, Bound.le(0).ty)))
+
+        with self.assertRaises(AttributeError):
+            b.n = 4
+
+        # interning for another automaton replaces the shared instances
+        Bound.intern(1)
+        self.assertIsNot(Bound.leq(3), b)
+        self.assertEqual(Bound.leq(3), b)
+        self.assertIs(Bound.le(-1), Bound.le(-1))
+        self.assertIs(Bound.unbounded(), Bound.from_raw(INF))
@@ -2,9 +2,10 @@
 
 # pylint: disable=protected-access
 
+import copy
 import unittest
 
-from dbm.dbm import DBM
+from dbm.dbm import DBM, floyd_warshall
 from dbm.bound import Bound
 from dbm.constraint import Constraint
 
@@ -376,6 +377,222 @@ class TestDBM(unittest.TestCase):
                                     {test_name}",
                 )
 
+    def test_and_constr_incremental(self):
+        constraints = [
+            Constraint("x", "0", Bound.leq(5)),
+            Constraint("0", "y", Bound.le(-1)),
+            Constraint("y", "x", Bound.leq(2)),
+            Constraint("x", "y", Bound.leq(1)),
+        ]
+
+        d = DBM(["x", "y"])
+        d.reset(["x"])
+        d.delay()
+        for constr in constraints:
+            # a DBM created from a matrix is closed from scratch
+            d_full = DBM(["x", "y"], m=d.m)
+            d.and_constr(constr)
+            d_full.and_constr(constr)
+            d_full.canonicalize()
+            self.assertEqual(d.m, d_full.m, f"failed after adding {constr}")
+
+        d.and_constr(Constraint("0", "x", Bound.leq(-6)))
+        self.assertFalse(d.is_not_empty())
+
+    def test_reset_delay_keep_canonical(self):
+        d = DBM(["x", "y"])
+        d.delay()
+        d.and_constr(Constraint("0", "x", Bound.leq(-2)))
+        d.and_constr(Constraint("y", "0", Bound.le(7)))
+
+        for op in [lambda d: d.reset(["x"]), lambda d: d.delay()]:
+            op(d)
+            self.assertTrue(d._DBM__is_canonical)
+            # a DBM created from a matrix is closed from scratch
+            d_full = DBM(["x", "y"], m=d.m)
+            d_full.canonicalize()
+            self.assertEqual(d.m, d_full.m)
+
+    def test_hash(self):
+        m = [
+            [Bound.leq(0), Bound.leq(0), Bound.leq(0)],
+            [Bound.unbounded(), Bound.leq(0), Bound.leq(0)],
+            [Bound.leq(10), Bound.leq(0), Bound.leq(0)],
+        ]
+        # not canonical, has the same canonical form as d_1
+        d_1 = DBM(["x", "y"], m=m)
+        d_2 = DBM(["x", "y"], m=m)
+        d_2.canonicalize()
+        self.assertEqual(hash(d_1), hash(d_2))
+        self.assertIn(d_1, {d_2})
+
+        h = hash(d_1)
+        d_1.and_constr(Constraint("x", "0", Bound.leq(5)))
+        self.assertNotEqual(hash(d_1), h)
+        self.assertNotIn(d_1, {d_2})
+
+    def test_is_included_in(self):
+        d_small = DBM(["x", "y"])
+        d_small.delay()
+        d_small.and_constr(Constraint("x", "0", Bound.leq(3)))
+        d_large = DBM(["x", "y"])
+        d_large.delay()
+        d_large.and_constr(Constraint("x", "0", Bound.le(5)))
+        d_empty = DBM(["x", "y"])
+        d_empty.and_constr(Constraint("x", "0", Bound.le(0)))
+
+        self.assertTrue(d_small.is_included_in(d_large))
+        self.assertFalse(d_large.is_included_in(d_small))
+        self.assertTrue(d_small.is_included_in(d_small))
+        self.assertTrue(d_empty.is_included_in(d_small))
+        self.assertFalse(d_small.is_included_in(d_empty))
+
+    def test_deepcopy(self):
+        d = DBM(
+            ["x", "y"],
+            m=[
+                [Bound.leq(0), Bound.leq(-1), Bound.leq(-1)],
+                [Bound.leq(42), Bound.leq(0), Bound.leq(0)],
+                [Bound.leq(42), Bound.leq(0), Bound.leq(0)],
+            ],
+        )
+        d_copy = copy.deepcopy(d)
+        self.assertEqual(d_copy, d)
+
+        d_copy.and_constr(Constraint("x", "0", Bound.leq(10)))
+        self.assertEqual(d.m[1][0], Bound.leq(42), "copy shares matrix")
+        self.assertEqual(d_copy.m[1][0], Bound.leq(10))
+
+    def test_copy_on_write(self):
+        d = DBM(["x", "y"])
+        d.delay()
+        d_copy = d.copy()
+        self.assertIs(d_copy.raw, d.raw)
+
+        # delaying again does not modify the matrix
+        d_copy.delay()
+        self.assertIs(d_copy.raw, d.raw)
+
+        d_copy.and_constr(Constraint("x", "0", Bound.leq(10)))
+        self.assertIsNot(d_copy.raw, d.raw)
+        self.assertEqual(d.m[1][0], Bound.unbounded())
+        self.assertEqual(d_copy.m[1][0], Bound.leq(10))
+
+        # constraints that are already satisfied do not close the matrix
+        d_copy_3 = d_copy.copy()
+        d_copy_3.and_constrs(
+            [Constraint("x", "0", Bound.leq(12)), Constraint("0", "y", Bound.leq(0))]
+        )
+        self.assertIs(d_copy_3.raw, d_copy.raw)
+        self.assertTrue(d_copy_3.is_not_empty())
+
+        d_copy_2 = d.copy()
+        d.reset(["x"])
+        self.assertEqual(d_copy_2.m[0][1], Bound.leq(0))
+        self.assertEqual(d_copy_2.m[1][0], Bound.unbounded())
+
+    def test_and_constrs_touched(self):
+        # 0 ≤ x - y ≤ 4 and y ≥ 0, entries that are derived when the matrix
+        # is closed over the touched clocks, None if the zone becomes empty
+        test_cases = [
+            (
+                "upper bound of x from y ≤ 2",
+                [
+                    Constraint("y", "0", Bound.leq(2)),
+                    Constraint("0", "x", Bound.leq(-3)),
+                ],
+                {(1, 0): Bound.leq(6), (0, 1): Bound.leq(-3), (0, 2): Bound.leq(0)},
+            ),
+            (
+                "equality x = y + 1",
+                [
+                    Constraint("x", "y", Bound.leq(1)),
+                    Constraint("y", "x", Bound.leq(-1)),
+                ],
+                {(1, 2): Bound.leq(1), (2, 1): Bound.leq(-1), (0, 1): Bound.leq(-1)},
+            ),
+            (
+                "negative cycle via x ≥ y",
+                [
+                    Constraint("x", "0", Bound.leq(1)),
+                    Constraint("0", "y", Bound.le(-1)),
+                ],
+                None,
+            ),
+            (
+                "already satisfied",
+                [
+                    Constraint("x", "y", Bound.leq(5)),
+                    Constraint("0", "y", Bound.leq(0)),
+                ],
+                {(1, 2): Bound.leq(4), (2, 1): Bound.leq(0), (1, 0): Bound.unbounded()},
+            ),
+        ]
+        for test_name, constrs, expected in test_cases:
+            d = DBM(["x", "y"])
+            d.and_constr(Constraint("x", "0", Bound.leq(4)))
+            d.reset(["y"])
+            d.delay()
+
+            d.and_constrs(constrs)
+            self.assertEqual(d.is_not_empty(), expected is not None, test_name)
+            if expected is not None:
+                m = d.m
+                for (i, j), b in expected.items():
+                    self.assertEqual(m[i][j], b, f"failed case {test_name} at {i}, {j}")
+
+    def test_down_free(self):
+        # 2 ≤ x ≤ 5 and y = x + 1
+        d = DBM(["x", "y"])
+        d.free(["x", "y"])
+        self.assertEqual(d.m[1][2], Bound.unbounded())
+        d.and_constr(Constraint("y", "x", Bound.leq(1)))
+        d.and_constr(Constraint("x", "y", Bound.leq(-1)))
+        d.and_constr(Constraint("0", "x", Bound.leq(-2)))
+        d.and_constr(Constraint("x", "0", Bound.leq(5)))
+
+        d_down = d.copy()
+        d_down.down()
+        self.assertEqual(d_down.m[0][1], Bound.leq(0))
+        self.assertEqual(d_down.m[0][2], Bound.leq(-1))
+        self.assertEqual(d_down.m[1][0], Bound.leq(5))
+        self.assertEqual(d_down.m[2][1], Bound.leq(1))
+        # the past stays canonical
+        expected = DBM(["x", "y"], d_down.m)
+        expected.canonicalize()
+        self.assertEqual(d_down.raw, expected.raw)
+
+        d_free = d.copy()
+        d_free.free(["x"])
+        self.assertEqual(d_free.m[0][1], Bound.leq(0))
+        self.assertEqual(d_free.m[1][0], Bound.unbounded())
+        self.assertEqual(d_free.m[1][2], Bound.unbounded())
+        self.assertEqual(d_free.m[0][2], Bound.leq(-3))
+        self.assertEqual(d_free.m[2][0], Bound.leq(6))
+        expected = DBM(["x", "y"], d_free.m)
+        expected.canonicalize()
+        self.assertEqual(d_free.raw, expected.raw)
+
+    def test_closure_emptiness(self):
+        # x - y < 1 and y - x ≤ -1 form a cycle of weight < 0
+        d = DBM(
+            ["x", "y"],
+            [
+                [Bound.leq(0), Bound.leq(0), Bound.leq(0)],
+                [Bound.leq(5), Bound.leq(0), Bound.le(1)],
+                [Bound.leq(5), Bound.leq(-1), Bound.leq(0)],
+            ],
+        )
+        self.assertFalse(floyd_warshall(d.raw, d.dim))
+
+        d = DBM(["x", "y"], d.m)
+        self.assertFalse(d.canonicalize())
+        self.assertFalse(d.is_not_empty())
+
+        d = DBM(["x", "y"])
+        d.delay()
+        self.assertTrue(floyd_warshall(d.raw, d.dim))
+
 
 def test_intersection(self):
     # TODO: coverage
@@ -0,0 +1,106 @@
+""" Unit tests for operations on batches of DBMs"""
+
+import unittest
+
+from typing import List
+
+from dbm.bound import Bound
+from dbm.constraint import Constraint, ZERO
+from dbm.dbm_batch import DBMBatch
+from dbm.dbm_global import DBMG, DELTA
+
+
+def zone(*constraints: "Constraint") -> "DBMG":
+    """Creates a zone over free clocks x, y and delta restricted by the
+    constraints
+    """
+    d = DBMG(["x", "y"])
+    d.free(["x", "y", DELTA])
+    for c in constraints:
+        d.and_constr(c)
+    return d
+
+
+def eq(c_1: str, c_2: str, n: int = 0) -> List["Constraint"]:
+    """Returns the constraints c_1 - c_2 = n"""
+    return [Constraint(c_1, c_2, Bound.leq(n)), Constraint(c_2, c_1, Bound.leq(-n))]
+
+
+class TestDBMBatch(unittest.TestCase):
+    """Unit tests for class DBMBatch"""
+
+    def test_operations(self):
+        zones = [
+            # x = y = delta ≤ 1
+            zone(*eq("x", "y"), *eq("y", DELTA), Constraint("x", ZERO, Bound.leq(1))),
+            # 2 ≤ x = y = delta ≤ 3
+            zone(
+                *eq("x", "y"),
+                *eq("y", DELTA),
+                Constraint(ZERO, "x", Bound.leq(-2)),
+                Constraint("x", ZERO, Bound.leq(3)),
+            ),
+            # x = delta = y + 2
+            zone(*eq("x", DELTA), *eq("x", "y", 2)),
+            # empty
+            zone(Constraint("x", ZERO, Bound.le(0))),
+        ]
+        batch = DBMBatch(zones)
+        self.assertEqual(batch.empty, [False, False, False, True])
+
+        # x = delta = y + 2 ≤ 2 leaves only y = 0
+        batch.and_constr(Constraint("x", ZERO, Bound.leq(2)))
+        self.assertEqual(batch.empty, [False, False, False, True])
+        expected = [
+            zones[0],
+            zone(*eq("x", "y"), *eq("y", DELTA), *eq("x", ZERO, 2)),
+            zone(*eq("x", DELTA), *eq("x", ZERO, 2), *eq("y", ZERO)),
+        ]
+        self.assertEqual(batch.get_zones()[:3], expected)
+
+        batch.reset(["y"])
+        batch.delay()
+        expected = [
+            zone(
+                *eq("x", DELTA),
+                Constraint("x", "y", Bound.leq(1)),
+                Constraint("y", "x", Bound.leq(0)),
+            ),
+            zone(*eq("x", DELTA), *eq("x", "y", 2)),
+            zone(*eq("x", DELTA), *eq("x", "y", 2)),
+        ]
+        self.assertEqual(batch.get_zones()[:3], expected)
+
+        # the first zone is the only one with x - y < 2
+        batch.and_constr(Constraint(ZERO, "y", Bound.leq(-1)))
+        batch.and_constr(Constraint("x", "y", Bound.le(2)))
+        self.assertEqual(batch.empty, [False, True, True, True])
+
+        batch.free(["y"])
+        batch.canonicalize()
+        zone_0 = batch.get_zones()[0]
+        self.assertIsInstance(zone_0, DBMG)
+        self.assertEqual(
+            zone_0, zone(*eq("x", DELTA), Constraint(ZERO, "x", Bound.leq(-1)))
+        )
+
+    def test_extrapolate(self):
+        zones = [
+            # x = delta ≥ 4
+            zone(*eq("x", DELTA), Constraint(ZERO, "x", Bound.leq(-4))),
+            # x = delta ≤ 1
+            zone(*eq("x", DELTA), Constraint("x", ZERO, Bound.leq(1))),
+        ]
+        batch = DBMBatch(zones)
+        batch.extrapolate(2, 10)
+        extrapolated = batch.get_zones()
+
+        # the lower bound of x beyond its maximal constant 2 is relaxed to
+        # x > 2, the global clock is kept up to 10
+        m = extrapolated[0].m
+        self.assertEqual(m[0][1], Bound.le(-2))
+        self.assertEqual(m[0][3], Bound.leq(-4))
+        self.assertEqual(m[1][0], Bound.unbounded())
+
+        # bounds below the maximal constants are kept
+        self.assertEqual(extrapolated[1].raw, zones[1].raw)
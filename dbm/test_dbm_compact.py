@@ -0,0 +1,128 @@
+""" Unit tests for the compact DBM representation"""
+
+import unittest
+
+from dbm.dbm import DBM
+from dbm.dbm_compact import CompactDBM
+from dbm.dbm_global import DBMG
+from dbm.bound import Bound
+from dbm.constraint import Constraint
+
+
+def zone(clocks, *constraints: "Constraint") -> DBM:
+    """Creates a zone over free clocks restricted by the constraints"""
+    d = DBM(clocks)
+    d.free(clocks)
+    for c in constraints:
+        d.and_constr(c)
+    return d
+
+
+X_LEQ_1 = Constraint("x", "0", Bound.leq(1))
+X_LE_1 = Constraint("x", "0", Bound.le(1))
+X_LEQ_2 = Constraint("x", "0", Bound.leq(2))
+X_EQ_Y = [Constraint("x", "y", Bound.leq(0)), Constraint("y", "x", Bound.leq(0))]
+
+
+class TestCompactDBM(unittest.TestCase):
+    """Unit tests for class CompactDBM"""
+
+    def test_expand(self):
+        # zones and their minimal constraints (i, j, raw bound), where the
+        # raw bound of ≤ n is 2n + 1 and that of < n is 2n
+        test_cases = [
+            ("free", zone(["x", "y", "z"]), [(0, 1, 1), (0, 2, 1), (0, 3, 1)]),
+            (
+                "equality cycle x = y = z",
+                zone(
+                    ["x", "y", "z"],
+                    Constraint("x", "y", Bound.leq(0)),
+                    Constraint("y", "z", Bound.leq(0)),
+                    Constraint("z", "x", Bound.leq(0)),
+                ),
+                [(0, 1, 1), (1, 2, 1), (2, 3, 1), (3, 1, 1)],
+            ),
+            (
+                "strict 1 < x = y < 3",
+                zone(
+                    ["x", "y"],
+                    Constraint("0", "x", Bound.le(-1)),
+                    Constraint("x", "0", Bound.le(3)),
+                    *X_EQ_Y,
+                ),
+                [(0, 1, -2), (1, 0, 6), (1, 2, 1), (2, 1, 1)],
+            ),
+            (
+                "difference 0 ≤ x - y ≤ 2",
+                zone(
+                    ["x", "y"],
+                    Constraint("x", "y", Bound.leq(2)),
+                    Constraint("y", "x", Bound.leq(0)),
+                ),
+                [(0, 2, 1), (1, 2, 5), (2, 1, 1)],
+            ),
+            (
+                "redundant differences of x, y ≤ 1",
+                zone(
+                    ["x", "y"],
+                    X_LEQ_1,
+                    Constraint("y", "0", Bound.leq(1)),
+                    Constraint("x", "y", Bound.leq(1)),
+                ),
+                [(0, 1, 1), (0, 2, 1), (1, 0, 3), (2, 0, 3)],
+            ),
+        ]
+        for test_name, d, expected in test_cases:
+            c = CompactDBM(d)
+            self.assertEqual(
+                sorted(c.get_constraints()), expected, f"failed case {test_name}"
+            )
+            self.assertEqual(c.expand(), d, f"failed to restore {test_name}")
+
+    def test_minimal(self):
+        # x = y, both clocks are unbounded
+        d = DBM(["x", "y"])
+        self.assertEqual(
+            sorted(CompactDBM(d).get_constraints()),
+            sorted([(1, 2, 1), (2, 1, 1), (0, 1, 1)]),
+        )
+
+    def test_eq_hash(self):
+        d_1 = DBM(["x", "y"])
+        d_1.delay()
+        d_2 = DBM(["x", "y"], m=d_1.m)
+        self.assertEqual(CompactDBM(d_1), CompactDBM(d_2))
+        self.assertEqual(hash(CompactDBM(d_1)), hash(CompactDBM(d_2)))
+
+        d_2.and_constr(Constraint("x", "0", Bound.leq(3)))
+        self.assertNotEqual(CompactDBM(d_1), CompactDBM(d_2))
+
+    def test_includes(self):
+        empty = zone(["x", "y"], Constraint("x", "0", Bound.le(0)))
+        test_cases = [
+            ("x ≤ 2 includes x ≤ 1", [X_LEQ_2], [X_LEQ_1], True),
+            ("x ≤ 1 does not include x ≤ 2", [X_LEQ_1], [X_LEQ_2], False),
+            ("x ≤ 1 includes x < 1", [X_LEQ_1], [X_LE_1], True),
+            ("x < 1 does not include x ≤ 1", [X_LE_1], [X_LEQ_1], False),
+            ("x ≤ 1 includes x = y ≤ 1", [X_LEQ_1], [X_LEQ_1, *X_EQ_Y], True),
+            ("x = y does not include x ≤ 1", X_EQ_Y, [X_LEQ_1], False),
+        ]
+        for test_name, constrs_1, constrs_2, expected in test_cases:
+            d_1 = zone(["x", "y"], *constrs_1)
+            d_2 = zone(["x", "y"], *constrs_2)
+            self.assertEqual(
+                CompactDBM(d_1).includes(d_2), expected, f"failed case {test_name}"
+            )
+            self.assertEqual(d_2.is_included_in(d_1), expected)
+
+            # every zone includes the empty zone
+            self.assertTrue(CompactDBM(d_1).includes(empty), test_name)
+
+    def test_empty(self):
+        d = DBM(["x"])
+        d.and_constr(Constraint("x", "0", Bound.le(0)))
+        self.assertFalse(CompactDBM(d).expand().is_not_empty())
+
+    def test_expand_type(self):
+        d = DBMG(["x"])
+        self.assertIsInstance(CompactDBM(d).expand(), DBMG)
@@ -2,9 +2,9 @@
 
 import unittest
 
-from dbm.dbm_global import DBMG, DELTA
+from dbm.dbm_global import DBMG, DELTA, SingleClockDBMG, new_dbmg
 from dbm.bound import Bound
-from dbm.constraint import ZERO
+from dbm.constraint import Constraint, ZERO
 
 
 class TestDBMG(unittest.TestCase):
@@ -54,3 +54,127 @@ class TestDBMG(unittest.TestCase):
             ],
         )
         self.assertGreater(d_1, d_2)
+
+    def test_extrapolate_lu(self):
+        d = DBMG(["x", "y"])
+        d.delay()
+        # 4 ≤ x = y ≤ 6
+        d.and_constr(Constraint("0", "x", Bound.leq(-4)))
+        d.and_constr(Constraint("x", "0", Bound.leq(6)))
+
+        # x is only compared in upper bounds up to 5: the lower bound of x is
+        # kept, its upper bound and all differences with x as minuend are
+        # removed. y is never compared, its lower bound is relaxed to ≥ 0.
+        d.extrapolate_lu({DELTA: 10}, {"x": 5, DELTA: 10})
+        m = d.m
+        self.assertEqual(m[0][1], Bound.leq(-4))
+        self.assertEqual(m[1][0], Bound.unbounded())
+        self.assertEqual(m[0][2], Bound.leq(0))
+        self.assertEqual(m[2][0], Bound.unbounded())
+        self.assertEqual(m[1][3], Bound.unbounded())
+        # the global clock is still exact
+        self.assertEqual(d.get_min_global_bound(), Bound.leq(-4))
+        self.assertEqual(d.get_max_global_bound(), Bound.leq(6))
+
+        # x ≥ 8 is relaxed to x > 5 if x is compared up to 5
+        d = DBMG(["x"])
+        d.delay()
+        d.and_constr(Constraint("0", "x", Bound.leq(-8)))
+        d.extrapolate_lu({"x": 5}, {"x": 5})
+        self.assertEqual(d.m[0][1], Bound.le(-5))
+
+    def test_extrapolate_copy(self):
+        d = DBMG(["x"])
+        d.delay()
+        d.and_constr(Constraint("x", "0", Bound.leq(3)))
+
+        # a copy shares the matrix until extrapolation changes it
+        c = d.copy()
+        c.extrapolate(5, 5)
+        c.extrapolate_lu({"x": 5, DELTA: 5}, {"x": 5, DELTA: 5})
+        self.assertIs(c.raw, d.raw)
+
+        c.extrapolate(2, 2)
+        self.assertIsNot(c.raw, d.raw)
+        self.assertEqual(c.get_max_bound_on_clock("x"), Bound.unbounded())
+        self.assertEqual(d.get_max_bound_on_clock("x"), Bound.leq(3))
+
+    def test_single_clock(self):
+        self.assertIsInstance(new_dbmg(["x"]), SingleClockDBMG)
+        self.assertNotIsInstance(new_dbmg(["x", "y"]), SingleClockDBMG)
+
+        # operation sequences with their resulting zone as constraints over
+        # free clocks, None if the zone is empty
+        x_eq_delta = [
+            Constraint("x", DELTA, Bound.leq(0)),
+            Constraint(DELTA, "x", Bound.leq(0)),
+        ]
+        test_cases = [
+            (
+                "delay and bounds",
+                [
+                    ("delay", None),
+                    ("and", Constraint(ZERO, "x", Bound.leq(-2))),
+                    ("and", Constraint("x", ZERO, Bound.leq(5))),
+                ],
+                x_eq_delta
+                + [
+                    Constraint(ZERO, "x", Bound.leq(-2)),
+                    Constraint("x", ZERO, Bound.leq(5)),
+                ],
+            ),
+            (
+                "reset after delay",
+                [
+                    ("delay", None),
+                    ("and", Constraint(ZERO, "x", Bound.leq(-1))),
+                    ("and", Constraint("x", ZERO, Bound.leq(2))),
+                    ("reset", None),
+                    ("delay", None),
+                ],
+                [
+                    Constraint("x", DELTA, Bound.leq(-1)),
+                    Constraint(DELTA, "x", Bound.leq(2)),
+                ],
+            ),
+            (
+                "strict empty",
+                [
+                    ("delay", None),
+                    ("and", Constraint("x", ZERO, Bound.leq(1))),
+                    ("and", Constraint(ZERO, "x", Bound.le(-1))),
+                ],
+                None,
+            ),
+            (
+                "extrapolated x = delta ≥ 8",
+                [
+                    ("delay", None),
+                    ("and", Constraint(ZERO, "x", Bound.leq(-8))),
+                    ("extrapolate", (3, 6)),
+                ],
+                x_eq_delta + [Constraint(ZERO, "x", Bound.le(-6))],
+            ),
+        ]
+        for test_name, ops, expected in test_cases:
+            d = DBMG(["x"])
+            d_single = SingleClockDBMG(["x"])
+            for zone in (d, d_single):
+                for op, arg in ops:
+                    if op == "and":
+                        zone.and_constr(arg)
+                    elif op == "reset":
+                        zone.reset(["x"])
+                    elif op == "delay":
+                        zone.delay()
+                    else:
+                        zone.extrapolate(*arg)
+
+            self.assertEqual(d_single.is_not_empty(), expected is not None, test_name)
+            self.assertEqual(d.is_not_empty(), expected is not None, test_name)
+            if expected is not None:
+                expected_zone = DBMG(["x"])
+                expected_zone.free(["x", DELTA])
+                expected_zone.and_constrs(expected)
+                self.assertEqual(d_single, expected_zone, test_name)
+                self.assertEqual(d_single.raw, d.raw, test_name)
@@ -0,0 +1,119 @@
+""" Unit tests for federations of DBMs"""
+
+import unittest
+
+from dbm.bound import Bound
+from dbm.constraint import Constraint
+from dbm.dbm import DBM
+from dbm.federation import Federation, MergeMode, convex_union
+
+
+def zone(*constraints: "Constraint") -> "DBM":
+    """Creates a delayed zone over clocks x and y restricted by constraints"""
+    d = DBM(["x", "y"])
+    d.delay()
+    for c in constraints:
+        d.and_constr(c)
+    return d
+
+
+X_LEQ_1 = Constraint("x", "0", Bound.leq(1))
+X_GEQ_1 = Constraint("0", "x", Bound.leq(-1))
+X_GT_1 = Constraint("0", "x", Bound.le(-1))
+X_LEQ_2 = Constraint("x", "0", Bound.leq(2))
+X_GEQ_2 = Constraint("0", "x", Bound.leq(-2))
+
+
+class TestFederation(unittest.TestCase):
+    """Unit tests for class Federation"""
+
+    def test_convex_union(self):
+        # x ≤ 1 and 1 ≤ x ≤ 2 (x = y) is x ≤ 2
+        union = convex_union(zone(X_LEQ_1), zone(X_GEQ_1, X_LEQ_2))
+        self.assertEqual(union, zone(X_LEQ_2))
+
+        # adjacent with a strict bound
+        union = convex_union(zone(X_LEQ_1), zone(X_GT_1, X_LEQ_2))
+        self.assertEqual(union, zone(X_LEQ_2))
+
+        # x ≤ 1 and x ≥ 2 leave a gap
+        self.assertIsNone(convex_union(zone(X_LEQ_1), zone(X_GEQ_2)))
+
+        # x ≤ 2 ∧ y ≤ 1 and x ≤ 1 ∧ y ≤ 2 form a staircase
+        free = [
+            [Bound.leq(0), Bound.leq(0), Bound.leq(0)],
+            [Bound.unbounded(), Bound.leq(0), Bound.unbounded()],
+            [Bound.unbounded(), Bound.unbounded(), Bound.leq(0)],
+        ]
+        d_1 = DBM(["x", "y"], free)
+        d_1.and_constr(Constraint("x", "0", Bound.leq(2)))
+        d_1.and_constr(Constraint("y", "0", Bound.leq(1)))
+        d_2 = DBM(["x", "y"], free)
+        d_2.and_constr(Constraint("x", "0", Bound.leq(1)))
+        d_2.and_constr(Constraint("y", "0", Bound.leq(2)))
+        self.assertIsNone(convex_union(d_1, d_2))
+
+        # x ≤ 2 ∧ y ≤ 1 and x ≤ 2 ∧ 1 ≤ y ≤ 2 form a rectangle
+        d_2 = DBM(["x", "y"], free)
+        d_2.and_constr(Constraint("x", "0", Bound.leq(2)))
+        d_2.and_constr(Constraint("y", "0", Bound.leq(2)))
+        d_2.and_constr(Constraint("0", "y", Bound.leq(-1)))
+        self.assertEqual(convex_union(d_1, d_2), d_1.convex_hull(d_2))
+
+    def test_exact(self):
+        fed = Federation([zone(X_LEQ_1), zone(X_GEQ_2)])
+        self.assertEqual(len(fed), 2)
+
+        # included zones are dropped
+        fed.add(zone(X_LEQ_1, X_GEQ_1))
+        self.assertEqual(len(fed), 2)
+
+        # closing the gap merges all zones into one
+        fed.add(zone(X_GEQ_1, X_LEQ_2))
+        self.assertEqual(list(fed), [zone()])
+
+    def test_empty(self):
+        # x ≤ 1 ∧ x ≥ 2 is empty and is neither stored nor merged
+        empty = zone(X_LEQ_1, X_GEQ_2)
+        for mode in [MergeMode.EXACT, MergeMode.HULL]:
+            fed = Federation([empty], mode=mode)
+            self.assertEqual(len(fed), 0)
+            fed.add(zone(X_LEQ_1))
+            fed.add(empty)
+            self.assertEqual(list(fed), [zone(X_LEQ_1)])
+        self.assertEqual(len(Federation([empty], mode=MergeMode.NONE)), 1)
+
+    def test_equality(self):
+        # y = x + 1 with x ≤ 1 and with 1 ≤ x ≤ 2 merge to y = x + 1 with
+        # x ≤ 2, the parallel zone y = x + 2 is kept apart
+        free = [
+            [Bound.leq(0), Bound.leq(0), Bound.leq(0)],
+            [Bound.unbounded(), Bound.leq(0), Bound.unbounded()],
+            [Bound.unbounded(), Bound.unbounded(), Bound.leq(0)],
+        ]
+
+        def shifted(n: int, *constraints: "Constraint") -> "DBM":
+            d = DBM(["x", "y"], free)
+            d.and_constr(Constraint("y", "x", Bound.leq(n)))
+            d.and_constr(Constraint("x", "y", Bound.leq(-n)))
+            for c in constraints:
+                d.and_constr(c)
+            return d
+
+        fed = Federation([shifted(1, X_LEQ_1), shifted(2, X_LEQ_1)])
+        fed.add(shifted(1, X_GEQ_1, X_LEQ_2))
+        self.assertEqual(len(fed), 2)
+        self.assertEqual(set(fed), {shifted(1, X_LEQ_2), shifted(2, X_LEQ_1)})
+
+    def test_hull(self):
+        fed = Federation([zone(X_LEQ_1), zone(X_GEQ_2)], mode=MergeMode.HULL)
+        self.assertEqual(list(fed), [zone()])
+
+    def test_none(self):
+        fed = Federation([zone(X_LEQ_1), zone(X_LEQ_1)], mode=MergeMode.NONE)
+        self.assertEqual(len(fed), 2)
+
+    def test_compact(self):
+        zones = [zone(X_LEQ_1), zone(X_GEQ_2), zone(X_GEQ_1, X_LEQ_2)]
+        self.assertEqual(Federation(zones, compact=True), Federation(zones))
+        self.assertTrue(Federation(zones, compact=True).includes(zone(X_LEQ_2)))
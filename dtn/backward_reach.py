@@ -0,0 +1,112 @@
+""" This module implements a backward reachability analysis for guarded timed
+    automata, e.g. the summary automaton computed by
+    `DTNMinus.get_summary_automaton`.
+
+    Starting from the target locations, predecessors are computed until a
+    zone containing the initial state is found. Only the part of the state
+    space from which a target can be reached is explored.
+
+    Location guards are replaced by a lower bound on the global clock given
+    the minimal reach time of the guard location, as in the summary automaton.
+    In a DTN⁻ a location guard holds from the minimal reach time of its
+    location on, the bounds are those of `DTNMinus.min_reach` once the reach
+    times of the guard locations have been computed, e.g. with
+    `DTNMinus.min_reach_time_for`.
+"""
+
+import copy
+
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from dbm.bound import Bound
+from dbm.constraint import Constraint, ZERO
+from dbm.dbm_global import DBMG, DELTA, new_dbmg
+from dtn.gta import GTA, GTATransition
+
+
+def contains_origin(zone: "DBMG") -> bool:
+    """Checks whether the valuation assigning 0 to all clocks, including the
+    global clock, satisfies the zone
+    """
+    if not zone.canonicalize():
+        return False
+    # 0 - 0 satisfies a bound iff the bound is at least ≤ 0
+    return min(zone.raw) >= Bound.leq(0).to_raw()
+
+
+def is_reachable(
+    gta: "GTA",
+    targets: List[str],
+    horizon: int,
+    guard_reach_times: Optional[Mapping[str, "Bound"]] = None,
+) -> bool:
+    """Checks whether one of the target locations can be reached within
+    global time `horizon`
+
+    Args:
+        gta ("GTA"): automaton of the DTN⁻
+        targets (List[str]): locations to reach
+        horizon (int): maximal global time at which a target is reached
+        guard_reach_times (Optional[Mapping[str, "Bound"]]): minimal reach
+            time of every location appearing in a location guard as a bound
+            on 0 - delta (see `DTNMinus.min_reach`), unbounded if it is
+            unreachable. Only needed if the automaton has location guards.
+
+    Returns:
+        True if a target location is reachable
+    """
+    # incoming transitions per location with the global clock bound that
+    # replaces their location guard
+    incoming: Dict[str, List[Tuple["GTATransition", List["Constraint"]]]] = {
+        q: [] for q in gta.locations
+    }
+    for trans in gta.transitions.values():
+        guard_constr: List["Constraint"] = []
+        if trans.loc_guard is not None:
+            assert (
+                guard_reach_times is not None
+            ), "location guards require the reach times of the guard locations"
+            reach_bound = guard_reach_times[trans.loc_guard]
+            if reach_bound.is_unbounded():
+                # the guard never holds
+                continue
+            guard_constr = [Constraint(ZERO, DELTA, reach_bound)]
+        incoming[trans.target_loc].append((trans, guard_constr))
+
+    # All clocks start at 0 together with the global clock and are only reset,
+    # hence x ≤ delta holds for every reachable valuation. Together with the
+    # horizon this bounds all clocks, which ensures termination.
+    bounds = [Constraint(DELTA, ZERO, Bound.leq(horizon))]
+    bounds.extend(Constraint(c, DELTA, Bound.leq(0)) for c in gta.clocks)
+
+    visited: Dict[str, List["DBMG"]] = {q: [] for q in gta.locations}
+    waiting: List[Tuple[str, "DBMG"]] = []
+
+    def add(loc: str, zone: "DBMG") -> None:
+        if not zone.is_not_empty():
+            return
+        if any(zone.is_included_in(other) for other in visited[loc]):
+            return
+        visited[loc].append(zone)
+        waiting.append((loc, zone))
+
+    for loc in targets:
+        zone = new_dbmg(copy.copy(gta.clocks))
+        zone.free(list(zone.clocks)[1:])
+        zone.and_constrs(bounds)
+        if loc in gta.invariants:
+            zone.and_constr(gta.invariants[loc])
+        add(loc, zone)
+
+    while waiting:
+        loc, zone = waiting.pop()
+
+        if loc in gta.init_states and contains_origin(zone):
+            return True
+
+        for trans, guard_constr in incoming[loc]:
+            pre = gta.predecessor(zone, trans, guard_constr)
+            pre.and_constrs(bounds)
+            add(trans.source_loc, pre)
+
+    return False
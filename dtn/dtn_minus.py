@@ -7,15 +7,44 @@
 
 import time
 import copy
+import gzip
+import heapq
+import os
+import pickle
 
-from typing import Dict, Tuple, List
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Tuple, List, Optional, Union
 
-from dbm.bound import Bound, BoundType
+from dbm.bound import Bound, BoundType, raw_le
 from dbm.dbm import Constraint
-from dbm.dbm_global import DBMG
+from dbm.dbm_batch import DBMBatch
+from dbm.dbm_compact import CompactDBM
+from dbm.federation import Federation, MergeMode
+from dbm.dbm_global import DBMG, DELTA, Extrapolation, new_dbmg
 from dtn.gta import GTA, GTATransition
 from dtn.min_reach_time import get_min_reach_times
 
+# zones are stored either as DBMs or compactly, see `DTNMinus.compact`
+StoredZone = Union["DBMG", "CompactDBM"]
+
+# version of the checkpoint format written by `DTNMinus.save_checkpoint`
+CHECKPOINT_VERSION = 1
+
+
+@dataclass(order=True)
+class WaitingNode:
+    """
+    Entry of the waiting heap. Nodes are ordered by the minimal global time of
+    their zone and then by insertion order. A node removed from the waiting
+    set keeps its place in the heap with its zone set to None.
+    """
+
+    min_global: int
+    count: int
+    loc: str = field(compare=False)
+    zone: Optional["DBMG"] = field(compare=False)
+
 
 class DTNMinus:
     """DTNMinus implements the summary automaton construction for DTNs falling
@@ -23,47 +52,156 @@ class DTNMinus:
 
     Attributes:
         gta ("GTA"): The guarded timed automaton defining the DTN.
+        subsumption (bool): Whether zones included in an already explored
+            zone of the same location are discarded.
+        compact (bool): Whether explored zones are stored by their minimal
+            constraints.
+        merge ("MergeMode"): How the zones reaching a location at its minimal
+            reach time are merged.
+        extrapolation ("Extrapolation"): The abstraction applied to
+            successor zones.
+        active_clocks (bool): Whether inactive clocks are freed in all zones.
+        checkpoint_path (Optional[str]): File the search state is written to
+            periodically.
+        checkpoint_interval (float): Seconds between two checkpoints.
+        min_reach_zones (Dict[str, "Federation[DBMG]"]): The zones with which each
+            location is reached at its minimal reach time.
     """
 
-    def __init__(self, gta: "GTA") -> None:
+    def __init__(
+        self,
+        gta: "GTA",
+        *,
+        subsumption: bool = False,
+        compact: bool = False,
+        merge: "MergeMode" = MergeMode.EXACT,
+        extrapolation: "Extrapolation" = Extrapolation.M,
+        active_clocks: bool = False,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: float = 60.0,
+    ) -> None:
         """Initialize a DTNMinus.
 
         Args:
             gta ("GTA") : A guarded timed automaton that defines the DTN.
+            subsumption (bool): If set, a successor whose zone is included in
+                the zone of an explored node with the same location is
+                discarded and explored nodes covered by a new successor are
+                removed. By default, only equal nodes are discarded.
+            compact (bool): If set, zones of explored nodes and the zones
+                reaching a location at its minimal reach time are stored as
+                their minimal set of constraints (see `CompactDBM`) rather
+                than as full matrices. This reduces memory at the cost of
+                expanding zones when they are needed again.
+            merge ("MergeMode"): How the zones reaching a location at its
+                minimal reach time are combined. By default, included zones
+                are dropped and zones are merged if their union is convex.
+                `MergeMode.HULL` over-approximates them by a single zone.
+            extrapolation ("Extrapolation"): By default, all regular clocks
+                are extrapolated with the maximal clock constant of the
+                automaton. `Extrapolation.LU` uses the constants each clock is
+                compared against in lower and upper bounds (see
+                `DBMG.extrapolate_lu`), the local modes use the constants
+                per location (see `GTA.get_local_lu_bounds`). The global
+                clock is always extrapolated with delta max, the search is
+                restarted with a larger delta max if a minimal reach time
+                may have been cut off by it.
+            active_clocks (bool): If set, clocks that are not active in a
+                location (see `GTA.get_active_clocks`) are freed in the
+                zones of this location, such that zones only differing in
+                irrelevant clocks become equal. The minimal reach times are
+                not affected, but the minimal reach zones no longer bound
+                inactive clocks.
+            checkpoint_path (Optional[str]): If set, the state of the search
+                is saved to this file every `checkpoint_interval` seconds and
+                whenever a query returns, see `save_checkpoint` and `resume`.
+            checkpoint_interval (float): Wall clock seconds between two
+                checkpoints.
         """
-        self.gta = gta
-
-        self.max_clock_constr = gta.get_max_clock_guard()
+        self.__setup(
+            gta,
+            subsumption=subsumption,
+            compact=compact,
+            merge=merge,
+            extrapolation=extrapolation,
+            active_clocks=active_clocks,
+            checkpoint_path=checkpoint_path,
+            checkpoint_interval=checkpoint_interval,
+        )
 
         # Get the maximal reach time in the unguarded automaton
         max_reach_time: int = 0
-        for b in get_min_reach_times(gta).values():
+        for b in get_min_reach_times(gta, extrapolation, active_clocks).values():
             if b.get_value_abs() > max_reach_time and not b.is_unbounded():
                 max_reach_time = b.get_value_abs()
 
         # Compute exploration bound delta max
-        self.delta_max = max_reach_time * (gta.get_n_location_guards() + 1)
-        self.__executed = False
-
-        self.__waiting_set: List[Tuple[str, DBMG]] = []
-        self.__processing_set: List[Tuple[str, DBMG]] = []
+        self.__start_search(max_reach_time * (gta.get_n_location_guards() + 1))
+
+    def __setup(
+        self,
+        gta: "GTA",
+        *,
+        subsumption: bool,
+        compact: bool,
+        merge: "MergeMode",
+        extrapolation: "Extrapolation",
+        active_clocks: bool,
+        checkpoint_path: Optional[str],
+        checkpoint_interval: float,
+    ) -> None:
+        """Sets the options and everything derived from the automaton, the
+        search itself is started by `__start_search` or restored by
+        `__set_state`
+        """
+        self.gta = gta
+        self.subsumption = subsumption
+        self.compact = compact
+        self.merge = merge
+        self.extrapolation = extrapolation
+        self.active_clocks = active_clocks
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.__last_checkpoint = time.monotonic()
 
-        for s in gta.init_states:
-            d = DBMG(copy.copy(gta.clocks))
-            if s in gta.invariants:
-                d.and_constr(gta.invariants[s])
-            self.__waiting_set.append((s, copy.deepcopy(d)))
-            self.__processing_set.append((s, d))
+        self.max_clock_constr = gta.get_max_clock_guard()
+        # share Bound objects for the guard constants of the automaton
+        Bound.intern(self.max_clock_constr)
+
+        # L and U constants of all clocks per location for LU extrapolation
+        self.__lu_bounds = gta.get_extrapolation_bounds(extrapolation)
+
+        # clocks freed in the zones of each location
+        self.__inactive_clocks: Dict[str, List[str]] = {
+            q: [] for q in gta.locations
+        }
+        if active_clocks:
+            self.__inactive_clocks = gta.get_inactive_clocks()
+
+        # all zones share the clock index and the type of this zone
+        self.__template = new_dbmg(copy.copy(gta.clocks))
+
+        # minimal reach times known to be exact, they are kept when the search
+        # is restarted with a larger delta max
+        self.__settled: Dict[str, "Bound"] = {}
+        # whether the waiting set has been exhausted
+        self.__executed = False
+        self.execution_time = 0.0
+
+        # heap of the nodes to explore, ordered by minimum global reach time
+        self.__waiting_set: List[WaitingNode] = []
+        self.__n_waiting = 0
+        # all nodes that have been added to the waiting set with their entry in
+        # the waiting heap, indexed by location. Zones are hashed by their
+        # canonical form, the dicts are also used as insertion ordered sets.
+        self.__processing_set: Dict[str, Dict[StoredZone, WaitingNode]] = {}
+        # zones for which a transition was blocked by its location guard, per
+        # guard location and transition name
+        self.__blocked: Dict[str, Dict[str, List[StoredZone]]] = {}
 
         self.min_reach: Dict[str, "Bound"] = {}
         self.visited: Dict[str, bool] = {}
-        self.min_reach_zones: Dict[str, List["DBMG"]] = {}
-
-        for q in self.gta.locations:
-            self.min_reach[q] = Bound.unbounded()
-            self.min_reach_zones[q] = []
-            self.visited[q] = False
-        self.min_reach["empty"] = Bound.leq(0)
+        self.min_reach_zones: Dict[str, "Federation[DBMG]"] = {}
 
     def get_min_reach_time(self) -> Dict[str, int]:
         """Returns the minimal reach time for each location, inf indicates an
@@ -79,7 +217,134 @@ class DTNMinus:
             min_reach_times[location] = self.min_reach[location].get_value_abs()
         return min_reach_times
 
-    def get_summary_automaton(self) -> Tuple["GTA", Dict[str, List["DBMG"]]]:
+    def min_reach_time_for(
+        self, targets: Iterable[str], horizon: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Returns the minimal reach time of the given locations. The search
+        only runs until all targets have been reached or all remaining nodes
+        have a minimal global time above `horizon`, later calls continue the
+        search where it stopped. A checkpoint is saved before returning if
+        `checkpoint_path` is set.
+
+        Args:
+            targets (Iterable[str]): locations to compute the min reach time for
+            horizon (Optional[int]): maximal reach time of interest
+
+        Returns:
+            a dict mapping the targets to their minimal reach times, inf
+            indicates a location that is unreachable (within the horizon)
+        """
+        targets = list(targets)
+        pending = {q for q in targets if q not in self.__settled}
+
+        start_time = time.process_time()
+        while pending and not self.__search_exhausted():
+            if (
+                horizon is not None
+                and horizon < self.delta_max
+                and self.__waiting_set[0].min_global > horizon
+            ):
+                break
+            node = self.__step()
+            if node is not None:
+                pending.discard(node[0])
+        self.execution_time += time.process_time() - start_time
+        if self.checkpoint_path is not None:
+            self.save_checkpoint(self.checkpoint_path)
+
+        # targets that are not settled have not been reached (within the
+        # horizon)
+        min_reach_times: Dict[str, int] = {}
+        for location in targets:
+            min_reach_times[location] = self.__settled.get(
+                location, Bound.unbounded()
+            ).get_value_abs()
+        return min_reach_times
+
+    def iter_min_reach(self) -> Iterator[Tuple[str, "Bound", "DBMG"]]:
+        """Continues the search and yields every location as soon as its
+        minimal reach time is final, i.e. when it is reached for the first
+        time with a bound not relaxed by delta max. Locations yielded by
+        earlier calls or before a restart of the search are not yielded
+        again. A checkpoint is saved when the iteration ends or is stopped if
+        `checkpoint_path` is set.
+
+        Yields:
+            the location, its minimal reach time and the zone with which it
+            has been reached first
+        """
+        try:
+            while not self.__search_exhausted():
+                start_time = time.process_time()
+                node = self.__step()
+                self.execution_time += time.process_time() - start_time
+                if node is not None:
+                    location, zone = node
+                    yield location, self.min_reach[location], zone.copy()
+        finally:
+            # also reached when the caller stops iterating early
+            if self.checkpoint_path is not None:
+                self.save_checkpoint(self.checkpoint_path)
+
+    def save_checkpoint(self, path: str) -> None:
+        """Saves the state of the search to a file, it can be continued with
+        `resume`. The file is replaced atomically, such that an interrupted
+        write keeps the previous checkpoint.
+
+        Args:
+            path (str): file to write the gzip compressed checkpoint to
+        """
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            pickle.dump(self.__get_state(), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.__last_checkpoint = time.monotonic()
+
+    @classmethod
+    def resume(
+        cls, gta: "GTA", path: str, checkpoint_interval: float = 60.0
+    ) -> "DTNMinus":
+        """Continues a search from a checkpoint written by `save_checkpoint`.
+        The search is created with the options of the checkpoint and keeps
+        saving checkpoints to the same file. A ValueError is raised if the
+        checkpoint has an unknown format or belongs to another automaton.
+
+        Checkpoints are read with `pickle.load`, which can execute arbitrary
+        code. Only resume from checkpoints written by a trusted run.
+
+        Args:
+            gta ("GTA"): the automaton the checkpoint has been created for
+            path (str): checkpoint file
+            checkpoint_interval (float): seconds between two checkpoints
+
+        Returns:
+            the DTNMinus in the state of the checkpoint
+        """
+        with gzip.open(path, "rb") as f:
+            state = pickle.load(f)
+        if state["version"] != CHECKPOINT_VERSION:
+            raise ValueError(f"unknown checkpoint format in {path}")
+        if state["locations"] != list(gta.locations):
+            raise ValueError(f"checkpoint {path} belongs to a different automaton")
+
+        # the search is restored from the checkpoint instead of being started
+        options = state["options"]
+        algo = cls.__new__(cls)
+        cls.__setup(
+            algo,
+            gta,
+            subsumption=options["subsumption"],
+            compact=options["compact"],
+            merge=MergeMode[options["merge"]],
+            extrapolation=Extrapolation[options["extrapolation"]],
+            active_clocks=options["active_clocks"],
+            checkpoint_path=path,
+            checkpoint_interval=checkpoint_interval,
+        )
+        cls.__set_state(algo, state)
+        return algo
+
+    def get_summary_automaton(self) -> Tuple["GTA", Dict[str, "Federation[DBMG]"]]:
         """Returns the automaton where location guards are replaced by global
         clock guards
 
@@ -108,22 +373,201 @@ class DTNMinus:
             self.__minreach_algorithm()
         return self.execution_time
 
-    def __dependent_transitions(self, loc_guard: str) -> List["GTATransition"]:
-        """Computes the transitions that depend on the given location through a
-        location guard
+    def __get_state(self) -> Dict[str, Any]:
+        """Returns the state of the search as plain data, zones are encoded by
+        the bytes of their matrices
+        """
+
+        def encode(stored: StoredZone) -> bytes:
+            return self.__load(stored).raw.tobytes()
+
+        return {
+            "version": CHECKPOINT_VERSION,
+            "locations": list(self.gta.locations),
+            "clocks": dict(self.__template.clocks),
+            "options": {
+                "subsumption": self.subsumption,
+                "compact": self.compact,
+                "merge": self.merge.name,
+                "extrapolation": self.extrapolation.name,
+                "active_clocks": self.active_clocks,
+            },
+            "waiting": [
+                (
+                    entry.min_global,
+                    entry.count,
+                    entry.loc,
+                    None if entry.zone is None else encode(entry.zone),
+                )
+                for entry in self.__waiting_set
+            ],
+            "n_waiting": self.__n_waiting,
+            "processing": {
+                loc: [
+                    (encode(stored), entry.min_global, entry.count)
+                    for stored, entry in processing.items()
+                ]
+                for loc, processing in self.__processing_set.items()
+            },
+            "blocked": {
+                loc: {name: [encode(z) for z in zones] for name, zones in by.items()}
+                for loc, by in self.__blocked.items()
+            },
+            "delta_max": self.delta_max,
+            "settled": {loc: b.to_raw() for loc, b in self.__settled.items()},
+            "min_reach": {loc: b.to_raw() for loc, b in self.min_reach.items()},
+            "visited": dict(self.visited),
+            "min_reach_zones": {
+                loc: [zone.raw.tobytes() for zone in federation]
+                for loc, federation in self.min_reach_zones.items()
+            },
+            "execution_time": self.execution_time,
+            "executed": self.__executed,
+        }
+
+    def __set_state(self, state: Dict[str, Any]) -> None:
+        """Restores the state of the search from `__get_state`"""
+        if state["clocks"] != self.__template.clocks:
+            raise ValueError("checkpoint has different clocks than the automaton")
+
+        def decode(data: bytes) -> "DBMG":
+            raw = array("q")
+            raw.frombytes(data)
+            zone = self.__template.from_clock_index(self.__template.clocks, raw)
+            assert isinstance(zone, DBMG)
+            return zone
+
+        self.__set_delta_max(state["delta_max"])
+        self.__settled = {
+            loc: Bound.from_raw(raw) for loc, raw in state["settled"].items()
+        }
+
+        # the heap is restored in the same order, which keeps it a valid heap
+        self.__waiting_set = [
+            WaitingNode(key, count, loc, None if data is None else decode(data))
+            for key, count, loc, data in state["waiting"]
+        ]
+        self.__n_waiting = state["n_waiting"]
+
+        # processing entries of explored nodes are no longer in the heap
+        entries = {entry.count: entry for entry in self.__waiting_set}
+        self.__processing_set = {}
+        for loc, processing in state["processing"].items():
+            self.__processing_set[loc] = {}
+            for data, key, count in processing:
+                entry = entries.get(count, WaitingNode(key, count, loc, None))
+                self.__processing_set[loc][self.__store(decode(data))] = entry
+
+        self.__blocked = {
+            loc: {
+                name: [self.__store(decode(data)) for data in zones]
+                for name, zones in by.items()
+            }
+            for loc, by in state["blocked"].items()
+        }
+        self.min_reach = {
+            loc: Bound.from_raw(raw) for loc, raw in state["min_reach"].items()
+        }
+        self.visited = dict(state["visited"])
+        self.min_reach_zones = {
+            loc: self.__new_federation() for loc in state["min_reach_zones"]
+        }
+        for loc, zones in state["min_reach_zones"].items():
+            for data in zones:
+                self.min_reach_zones[loc].add(decode(data))
+        self.execution_time = state["execution_time"]
+        self.__executed = state["executed"]
+
+    def __set_delta_max(self, delta_max: int) -> None:
+        """Sets the bound with which the global clock is extrapolated"""
+        self.delta_max = delta_max
+        if self.__lu_bounds is not None:
+            for lower, upper in self.__lu_bounds.values():
+                lower[DELTA] = delta_max
+                upper[DELTA] = delta_max
+
+    def __start_search(self, delta_max: int) -> None:
+        """(Re)starts the search from the initial states, extrapolating the
+        global clock with the given delta max
+        """
+        self.__set_delta_max(delta_max)
+
+        self.__waiting_set = []
+        self.__n_waiting = 0
+        self.__processing_set = {q: {} for q in self.gta.locations}
+        self.__blocked = {}
+
+        for s in self.gta.init_states:
+            d = new_dbmg(copy.copy(self.gta.clocks))
+            if s in self.gta.invariants:
+                d.and_constr(self.gta.invariants[s])
+            d.free(self.__inactive_clocks[s])
+            self.__processing_set[s][self.__store(d)] = self.__push(s, d.copy())
+
+        self.min_reach = {}
+        self.visited = {}
+        self.min_reach_zones = {}
+        for q in self.gta.locations:
+            self.min_reach[q] = Bound.unbounded()
+            self.min_reach_zones[q] = self.__new_federation()
+            self.visited[q] = False
+        self.min_reach["empty"] = Bound.leq(0)
 
-        Arg:
-            loc_guard (str): location to find the dependent transitions for
+    def __is_cut_off(self, bound: "Bound") -> bool:
+        """Checks whether a lower bound on the global clock may have been
+        relaxed by the extrapolation with delta max. Extrapolation replaces
+        lower bounds beyond delta max by delta > delta max, all other bounds,
+        including delta ≥ delta max, are exact.
+        """
+        return bound.to_raw() <= raw_le(-self.delta_max)
 
-        Returns:
-            list of transition names
+    def __is_truncated(self) -> bool:
+        """Checks whether the minimal reach time of a location may have been
+        cut off by delta max, i.e. the location might only be reachable later
+        than its reach time in the extrapolated search
         """
-        dependent_transition: List["GTATransition"] = []
-        for _, trans in self.gta.transitions.items():
-            if trans.loc_guard == loc_guard:
-                dependent_transition.append(trans)
+        return any(self.__is_cut_off(self.min_reach[q]) for q in self.gta.locations)
 
-        return dependent_transition
+    def __search_exhausted(self) -> bool:
+        """Returns whether the search is finished. When the waiting set is
+        empty but a minimal reach time may have been cut off, the search is
+        restarted with twice the delta max.
+        """
+        if len(self.__waiting_set) != 0:
+            return False
+        if self.__is_truncated():
+            self.__start_search(max(2 * self.delta_max, 1))
+            return False
+        self.__executed = True
+        return True
+
+    def __new_federation(self) -> "Federation[DBMG]":
+        """Returns an empty federation for the minimal reach zones"""
+        return Federation(mode=self.merge, compact=self.compact)
+
+    def __store(self, zone: "DBMG") -> StoredZone:
+        """Returns the form in which a zone is stored in the processing set"""
+        if self.compact:
+            return CompactDBM(zone)
+        return zone
+
+    def __load(self, stored: StoredZone) -> "DBMG":
+        """Returns the zone for a stored zone, see `__store`"""
+        if isinstance(stored, CompactDBM):
+            zone = stored.expand()
+            assert isinstance(zone, DBMG)
+            return zone
+        return stored
+
+    def __extrapolate(self, zones: Union["DBMG", "DBMBatch"], loc: str) -> None:
+        """Applies the selected extrapolation to a zone or a batch of zones at
+        the given location and frees the inactive clocks of the location
+        """
+        if self.__lu_bounds is not None:
+            zones.extrapolate_lu(*self.__lu_bounds[loc])
+        else:
+            zones.extrapolate(self.max_clock_constr, self.delta_max)
+        zones.free(self.__inactive_clocks[loc])
 
     def __successor(self, zone: "DBMG", transition: "GTATransition") -> "DBMG":
         """Computes the successor of a transition
@@ -143,12 +587,48 @@ class DTNMinus:
             ]
 
         successor_zone = self.gta.successor(zone, transition, replacement_constr)
-        successor_zone.extrapolate(self.max_clock_constr, self.delta_max)
+        self.__extrapolate(successor_zone, transition.target_loc)
         return successor_zone
 
+    def __successor_batch(
+        self, zones: List["DBMG"], transition: "GTATransition"
+    ) -> List["DBMG"]:
+        """Computes the successors of a transition for many zones at once
+
+        Attr:
+            zones (List["DBMG"]): zones in the source location of the
+                transition
+            transition ("GTATransition): transition fo which to compute
+                the successors
+
+        Returns:
+            non-empty successor zones in the order of `zones`
+        """
+        replacement_constr = []
+        if transition.loc_guard in self.gta.locations:
+            replacement_constr = [
+                Constraint("0", "delta", self.min_reach[transition.loc_guard])
+            ]
+
+        batch = DBMBatch(zones)
+        self.gta.successor_batch(batch, transition, replacement_constr)
+        self.__extrapolate(batch, transition.target_loc)
+
+        successors = []
+        for zone, is_empty in zip(batch.get_zones(), batch.empty):
+            if not is_empty:
+                assert isinstance(zone, DBMG)
+                successors.append(zone)
+        return successors
+
     def __update_information(self, loc: str, new_min_reach_time: "Bound") -> None:
-        """Updates reachability for all given locations that have a location
-        guard depending on the given location
+        """Updates the minimal reach time of a location and fires the
+        transitions that have been blocked by a location guard on it
+
+        As nodes are explored in order of their minimal global time, the
+        minimal reach time of a location is final once the location has been
+        reached. Blocked transitions are therefore only released once and
+        all later zones fire them directly.
 
         Attr:
             loc (str): location for which the new min reach time has been
@@ -157,24 +637,52 @@ class DTNMinus:
         """
         self.min_reach[loc] = new_min_reach_time
 
-        for trans in self.__dependent_transitions(loc):
-            for index in range(len(self.__processing_set)):
-                source_loc = self.__processing_set[index][0]
-                source_zone = self.__processing_set[index][1]
-
-                if source_loc == trans.source_loc:
-                    successor_zone = self.__successor(source_zone, trans)
-                    successor_node = (trans.target_loc, successor_zone)
-                    if successor_node not in self.__processing_set:
-                        self.__waiting_set.append(successor_node)
-                        self.__processing_set.append(successor_node)
-                        # sort by minimum global reach time
-                        self.__waiting_set = sorted(
-                            self.__waiting_set, key=lambda x: x[1]
-                        )
-                        self.__processing_set = sorted(
-                            self.__processing_set, key=lambda x: x[1]
-                        )
+        for name, stored in self.__blocked.pop(loc, {}).items():
+            trans = self.gta.transitions[name]
+            source_zones = [self.__load(zone) for zone in stored]
+            # Empty successors are never explored and not added
+            for successor_zone in self.__successor_batch(source_zones, trans):
+                self.__add_node((trans.target_loc, successor_zone))
+
+    def __push(self, loc: str, zone: "DBMG") -> "WaitingNode":
+        """Adds a node to the waiting heap and returns its entry"""
+        entry = WaitingNode(
+            zone.get_min_global_bound().get_value_abs(), self.__n_waiting, loc, zone
+        )
+        self.__n_waiting += 1
+        heapq.heappush(self.__waiting_set, entry)
+        return entry
+
+    def __add_node(self, node: Tuple[str, "DBMG"]) -> None:
+        """Adds a node to the waiting and processing set unless it has been
+        added before
+
+        Attr:
+            node (Tuple[str, "DBMG"]): location and zone of the new node
+        """
+        loc, zone = node
+        processing = self.__processing_set[loc]
+        key = self.__store(zone)
+        if key in processing:
+            return
+
+        if self.subsumption:
+            covered = []
+            for other in processing:
+                # The included zone cannot have a smaller global lower bound
+                if isinstance(other, CompactDBM):
+                    if other.includes(zone):
+                        return
+                elif zone.is_included_in(other):
+                    return
+                if self.__load(other).is_included_in(zone):
+                    covered.append(other)
+
+            for other in covered:
+                # the entry is skipped when it is popped from the waiting heap
+                processing.pop(other).zone = None
+
+        processing[key] = self.__push(loc, zone)
 
     def __add_successors(self, source_loc: str, source_zone: "DBMG") -> None:
         """Computes and adds all possible successors for a given location and
@@ -186,53 +694,80 @@ class DTNMinus:
                 reached
         """
         source_zone.canonicalize()
-        for _, trans in self.gta.transitions.items():
-            if trans.source_loc == source_loc:
-                if trans.loc_guard is not None:
-                    if not self.visited[trans.loc_guard]:
-                        continue
+        for name in self.gta.get_transitions_for_state(source_loc):
+            trans = self.gta.transitions[name]
+            if trans.loc_guard is not None:
+                if not self.visited[trans.loc_guard]:
+                    # fired once the guard location is reached
+                    blocked = self.__blocked.setdefault(trans.loc_guard, {})
+                    blocked.setdefault(name, []).append(self.__store(source_zone))
+                    continue
 
-                successor_zone = self.__successor(source_zone, trans)
+            successor_zone = self.__successor(source_zone, trans)
+            self.__add_node((trans.target_loc, successor_zone))
 
-                successor_node = (trans.target_loc, successor_zone)
+    def __step(self) -> Optional[Tuple[str, "DBMG"]]:
+        """Explores the node with the smallest minimal global time from the
+        waiting set, which must not be empty
 
-                if successor_node not in self.__processing_set:
-                    self.__processing_set.append(successor_node)
-                    self.__waiting_set.append(successor_node)
-                    # sort by minimum global reach time
-                    self.__waiting_set = sorted(self.__waiting_set, key=lambda x: x[1])
-                    self.__processing_set = sorted(
-                        self.__processing_set, key=lambda x: x[1]
-                    )
+        Returns:
+            the node if its minimal reach time has become known, i.e. if its
+            location has been reached for the first time with a bound that
+            has not been relaxed by delta max
+        """
+        if (
+            self.checkpoint_path is not None
+            and time.monotonic() - self.__last_checkpoint >= self.checkpoint_interval
+        ):
+            self.save_checkpoint(self.checkpoint_path)
+
+        entry = heapq.heappop(self.__waiting_set)
+        location, zone = entry.loc, entry.zone
+        # the entry stays in the processing set, without the zone such that
+        # only the stored form of an explored zone is kept
+        entry.zone = None
+        if zone is None or not zone.is_not_empty():
+            return None
+
+        first_reached = not self.visited[location]
+        self.visited[location] = True
+        new_min_reach_bound = zone.get_min_global_bound()
+
+        if new_min_reach_bound == self.min_reach[location]:
+            self.min_reach_zones[location].add(zone.copy())
+
+        # Update if we have a smaller global minimum reach time
+        if self.min_reach[location] == Bound.unbounded() or (
+            self.min_reach[location].get_value_abs()
+            > new_min_reach_bound.get_value_abs()
+        ):
+            self.min_reach_zones[location] = self.__new_federation()
+            self.min_reach_zones[location].add(zone.copy())
+            self.__update_information(location, new_min_reach_bound)
+
+        self.__add_successors(location, zone)
+        if (
+            first_reached
+            and location not in self.__settled
+            and not self.__is_cut_off(new_min_reach_bound)
+        ):
+            self.__settled[location] = new_min_reach_bound
+            return (location, zone)
+        return None
 
     def __minreach_algorithm(self) -> None:
         """This is the main algorithm loop for computing MINREACH as described
-        in the paper (Algorithm 1)
+        in the paper (Algorithm 1). It continues a search that has been
+        stopped by `min_reach_time_for`.
         """
         start_time = time.process_time()
-        self.__executed = True
-        while len(self.__waiting_set) != 0:
-            (location, zone) = self.__waiting_set.pop(0)
-
-            if zone is not None and zone.is_not_empty():
-                self.visited[location] = True
-                new_min_reach_bound = zone.get_min_global_bound()
-
-                if new_min_reach_bound == self.min_reach[location]:
-                    self.min_reach_zones[location].append(copy.deepcopy(zone))
-
-                # Update if we have a smaller global minimum reach time
-                if self.min_reach[location] == Bound.unbounded() or (
-                    self.min_reach[location].get_value_abs()
-                    > new_min_reach_bound.get_value_abs()
-                ):
-                    self.min_reach_zones[location] = [copy.deepcopy(zone)]
-                    self.__update_information(location, new_min_reach_bound)
-
-                self.__add_successors(location, zone)
+        while not self.__search_exhausted():
+            self.__step()
+        if self.checkpoint_path is not None:
+            self.save_checkpoint(self.checkpoint_path)
 
         end_time = time.process_time()
-        self.execution_time = end_time - start_time
+        self.execution_time += end_time - start_time
         print(f"\t Summary automaton construction took {self.execution_time}")
 
     def print_min_reach_times(self) -> None:
@@ -7,6 +7,7 @@ import math
 
 from typing import Dict, Tuple, List, Optional
 
+from dbm.federation import Federation, MergeMode
 from dtn.gta import GTA, DBMG
 from dtn.dtn_minus import DTNMinus
 
@@ -19,7 +20,9 @@ class DTNWithInv:
     def __init__(self, gta: "GTA") -> None:
         assert len(gta.clocks) == 1, "DTNWithInv only supports a single clock!"
         self.locations_to_check = gta.get_guarding_locations()
-        self.summary_a = DTNMinus(gta)
+        # the flooding check needs every zone reaching a location at its
+        # minimal reach time, not their union
+        self.summary_a = DTNMinus(gta, merge=MergeMode.NONE)
         self.gta, self.min_reach_zones = self.summary_a.get_summary_automaton()
         self.summary_construction_time = self.summary_a.get_execution_time()
         self.w_q: Dict[str, int] = {}
@@ -39,7 +42,9 @@ class DTNWithInv:
 
         return None
 
-    def get_summary_automaton(self) -> Optional[Tuple["GTA", Dict[str, List["DBMG"]]]]:
+    def get_summary_automaton(
+        self,
+    ) -> Optional[Tuple["GTA", Dict[str, "Federation[DBMG]"]]]:
         """Returns the automaton where location guards are replaced by global
         clock guards.  If a lasso could not be found for a location it
         returns None
@@ -10,13 +10,14 @@
 #     UPPAAL ?)
 
 import math
-import copy
 
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass
 
-from dbm.dbm import Constraint
-from dbm.dbm_global import DBMG
+from dbm.bound import Bound
+from dbm.dbm import Constraint, ZERO
+from dbm.dbm_batch import DBMBatch
+from dbm.dbm_global import DBMG, Extrapolation
 
 
 @dataclass
@@ -62,6 +63,32 @@ def to_gta_transitions(
     return parsed_transitions
 
 
+def add_lu_constant(
+    constr: "Constraint", lower: Dict[str, int], upper: Dict[str, int]
+) -> None:
+    """Updates the maximal lower (L) and upper (U) bound constants of the
+    clocks of a clock constraint, see `GTA.get_lu_bounds`
+    """
+    if constr.get_bound().is_unbounded():
+        return
+
+    def update(bounds: Dict[str, int], clock: str, n: int) -> None:
+        bounds[clock] = max(bounds.get(clock, n), n)
+
+    n = constr.get_bound().get_value()
+    c_1, c_2 = constr.get_c_1(), constr.get_c_2()
+    if c_2 == ZERO:
+        # c_1 < n or c_1 ≤ n
+        update(upper, c_1, n)
+    elif c_1 == ZERO:
+        # c_2 > -n or c_2 ≥ -n
+        update(lower, c_2, -n)
+    else:
+        for clock in (c_1, c_2):
+            update(lower, clock, abs(n))
+            update(upper, clock, abs(n))
+
+
 class GTA:
     """Guarded Timed Automaton (GTA) represents a guarded timed automaton
     template.
@@ -133,18 +160,22 @@ class GTA:
         Returns:
             successor zone
         """
-        # TODO: better handling of zone copies
-        zone = copy.deepcopy(zone)
+        # the matrix is only copied once the successor modifies it
+        zone = zone.copy()
 
         constraints = transition.clock_guard
         if add_constr is not None:
             assert isinstance(constraints, List)
-            constraints += add_constr
+            constraints = constraints + add_constr
 
-        for constraint in constraints:
-            zone.and_constr(constraint)
+        zone.and_constrs(constraints)
 
-        zone.canonicalize()
+        # The constraints are closed over the constrained clocks only and
+        # reset and delay preserve the canonical form, hence the zone is
+        # closed completely at most once here (if it was not canonical to
+        # begin with)
+        if not zone.canonicalize():
+            return zone
 
         zone.reset(transition.reset_clocks)
         zone.delay()
@@ -156,6 +187,91 @@ class GTA:
 
         return zone
 
+    def predecessor(
+        self,
+        zone: "DBMG",
+        transition: "GTATransition",
+        add_constr: Optional[List["Constraint"]] = None,
+    ) -> "DBMG":
+        """Computes the predecessor DBM for a given DBM, i.e. all clock
+        valuations in the source location of the transition from which a
+        valuation of `zone` in the target location can be reached by delaying
+        in the source location, taking the transition and delaying in the
+        target location. This is the inverse of `successor`.
+
+        Args:
+            zone ("DBM"): The zone in the target location for which to compute
+                the predecessor
+            transition ("GTATransition"): The transition that is taken
+                backwards.
+            add_constr (Optional[List["Constraint"]] ): Can currently be
+                used to pass an inferred replacement clock guard.
+
+        Returns:
+            predecessor zone
+        """
+        zone = zone.copy()
+
+        # delay backwards in the target location
+        if transition.target_loc in self.invariants:
+            zone.and_constr(self.invariants[transition.target_loc])
+        zone.down()
+        if transition.target_loc in self.invariants:
+            zone.and_constr(self.invariants[transition.target_loc])
+
+        # undo the reset, reset clocks are 0 after the transition and
+        # arbitrary before
+        zone.and_constrs(
+            [Constraint(c, ZERO, Bound.leq(0)) for c in transition.reset_clocks]
+        )
+        if not zone.canonicalize():
+            return zone
+        zone.free(transition.reset_clocks)
+
+        constraints = transition.clock_guard
+        if add_constr is not None:
+            constraints = constraints + add_constr
+        zone.and_constrs(constraints)
+
+        # delay backwards in the source location
+        zone.down()
+        if transition.source_loc in self.invariants:
+            zone.and_constr(self.invariants[transition.source_loc])
+
+        zone.canonicalize()
+
+        return zone
+
+    def successor_batch(
+        self,
+        batch: "DBMBatch",
+        transition: "GTATransition",
+        add_constr: Optional[List["Constraint"]] = None,
+    ) -> None:
+        """Computes the successors of all zones of a batch in place, see
+        `successor`.
+
+        Args:
+            batch ("DBMBatch"): zones for which to compute the successors
+            transition ("GTATransition"): The transition that is taken.
+            add_constr (Optional[List["Constraint"]] ): Can currently be
+                used to pass an inferred replacement clock guard.
+        """
+        constraints = transition.clock_guard
+        if add_constr is not None:
+            constraints = constraints + add_constr
+
+        for constraint in constraints:
+            batch.and_constr(constraint)
+
+        batch.reset(transition.reset_clocks)
+        batch.delay()
+
+        if transition.target_loc in self.invariants:
+            batch.and_constr(self.invariants[transition.target_loc])
+
+        batch.canonicalize()
+
     def get_transitions_for_state(self, loc: str) -> List[str]:
         """Returns the names of all transitions from the given location
 
@@ -225,6 +341,112 @@ class GTA:
                 curr_max = guard.get_bound().get_value_abs()
         return curr_max
 
+    def get_lu_bounds(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Returns for each clock the maximal constant it is compared against
+        in a lower bound (L) and in an upper bound (U) of a clock guard or
+        invariant. Clocks that are never compared are missing. For diagonal
+        constraints the absolute value is used as L and U of both clocks.
+
+        Returns:
+            tuple (L, U) of dicts mapping clock names to constants
+        """
+        lower: Dict[str, int] = {}
+        upper: Dict[str, int] = {}
+
+        for trans in self.transitions.values():
+            for guard in trans.clock_guard:
+                add_lu_constant(guard, lower, upper)
+        for invariant in self.invariants.values():
+            add_lu_constant(invariant, lower, upper)
+
+        return (lower, upper)
+
+    def get_local_lu_bounds(self) -> Dict[str, Tuple[Dict[str, int], Dict[str, int]]]:
+        """Returns L and U constants (see `get_lu_bounds`) for each location.
+        The constants of a clock at a location are the maximal constants the
+        clock can be compared against from this location on before it is
+        reset, i.e. in the invariant of the location or a guard of an
+        outgoing transition, or at a successor location if the transition
+        does not reset the clock.
+
+        Returns:
+            dict mapping locations to a tuple (L, U)
+        """
+        lower: Dict[str, Dict[str, int]] = {q: {} for q in self.locations}
+        upper: Dict[str, Dict[str, int]] = {q: {} for q in self.locations}
+
+        for trans in self.transitions.values():
+            for guard in trans.clock_guard:
+                add_lu_constant(guard, lower[trans.source_loc], upper[trans.source_loc])
+        for loc, invariant in self.invariants.items():
+            add_lu_constant(invariant, lower[loc], upper[loc])
+
+        # propagate the constants backwards until a fixpoint is reached
+        changed = True
+        while changed:
+            changed = False
+            for trans in self.transitions.values():
+                for bounds in (lower, upper):
+                    source = bounds[trans.source_loc]
+                    for clock, n in bounds[trans.target_loc].items():
+                        if clock in trans.reset_clocks:
+                            continue
+                        if source.get(clock, n - 1) < n:
+                            source[clock] = n
+                            changed = True
+
+        return {q: (lower[q], upper[q]) for q in self.locations}
+
+    def get_active_clocks(self) -> Dict[str, set[str]]:
+        """Returns the active clocks of each location. A clock is active at a
+        location if its value can be read, i.e. compared in an invariant or a
+        clock guard, before the clock is reset. The values of all other clocks
+        are irrelevant for the behavior from this location on.
+
+        Returns:
+            dict mapping locations to their active clocks
+        """
+        return {
+            q: set(lower) | set(upper)
+            for q, (lower, upper) in self.get_local_lu_bounds().items()
+        }
+
+    def get_inactive_clocks(self) -> Dict[str, List[str]]:
+        """Returns the clocks of each location that are not active, see
+        `get_active_clocks`
+
+        Returns:
+            dict mapping locations to their inactive clocks
+        """
+        active = self.get_active_clocks()
+        return {q: [c for c in self.clocks if c not in active[q]] for q in active}
+
+    def get_extrapolation_bounds(
+        self, extrapolation: "Extrapolation"
+    ) -> Optional[Dict[str, Tuple[Dict[str, int], Dict[str, int]]]]:
+        """Returns the L and U constants for each location that are used for
+        the given extrapolation
+
+        Returns:
+            dict mapping locations to a tuple (L, U), None for
+            `Extrapolation.M`
+        """
+        if extrapolation == Extrapolation.M:
+            return None
+
+        if extrapolation == Extrapolation.LU:
+            lower, upper = self.get_lu_bounds()
+            return {q: (lower, upper) for q in self.locations}
+
+        bounds = self.get_local_lu_bounds()
+        if extrapolation == Extrapolation.LOCAL_M:
+            for loc, (lower, upper) in bounds.items():
+                m = dict(lower)
+                for c, n in upper.items():
+                    m[c] = max(m.get(c, n), n)
+                bounds[loc] = (m, m)
+        return bounds
+
     def get_guarding_locations(self) -> set[str]:
         """Returns the locations that appear in a location guards
 
@@ -2,37 +2,87 @@
 """
 
 import copy
+import heapq
 import time
-import math
+
+from typing import Dict, List, Optional, Tuple, TypeVar
 
 from dtn.gta import GTA
-from dbm.dbm_global import DBMG, Bound
+from dbm.dbm import DBM
+from dbm.dbm_global import DBMG, Bound, Extrapolation, new_dbmg
+
+T = TypeVar("T")
+
+
+def get_visited_dbm(
+    zone: "DBMG",
+    m: int,
+    lu_bounds: Optional[Tuple[Dict[str, int], Dict[str, int]]] = None,
+) -> "DBM":
+    """Returns the representation of a zone used to check whether it has been
+    visited before. The global clock is not extrapolated in the zone itself to
+    keep the minimal reach times exact, therefore the zone is compared after
+    extrapolating all clocks with `m`, or with the given L and U constants,
+    and removing the global clock.
+    """
+    zone = zone.copy()
+    if lu_bounds is not None:
+        zone.extrapolate_lu(*lu_bounds)
+    else:
+        zone.extrapolate(m, m)
+    return zone.get_dbm()
+
+
+def get_local(bounds: Optional[Dict[str, T]], loc: str) -> Optional[T]:
+    """Returns the entry of a location in a dict that might be None"""
+    return None if bounds is None else bounds[loc]
 
 
-def get_min_reach_times(gta: "GTA"):
+def get_min_reach_times(
+    gta: "GTA",
+    extrapolation: "Extrapolation" = Extrapolation.M,
+    active_clocks: bool = False,
+):
     """Computes the minimal reachability for each state in the *unguarded*
     automaton
+
+    Args:
+        gta ("GTA"): the automaton, location guards are ignored
+        extrapolation ("Extrapolation"): the abstraction used to detect
+            visited zones
+        active_clocks (bool): whether clocks that are not active in a location
+            are freed in its zones, see `GTA.get_active_clocks`
     """
     start_time = time.process_time()
     min_reach = {}
     for loc in gta.locations:
         min_reach[loc] = Bound.unbounded()
 
-    visited = []
-    waiting = []
+    m = gta.get_max_clock_guard()
+    lu_bounds = gta.get_extrapolation_bounds(extrapolation)
+    inactive_clocks: Dict[str, List[str]] = {q: [] for q in gta.locations}
+    if active_clocks:
+        inactive_clocks = gta.get_inactive_clocks()
+
+    # zones that have been added to the waiting list before
+    visited = set()
+    # heap of (minimum global time, insertion count, location, zone)
+    waiting: List[Tuple[int, int, str, "DBMG"]] = []
+    count = 0
     for i in gta.init_states:
-        d = DBMG(copy.deepcopy(gta.clocks))
+        d = new_dbmg(copy.deepcopy(gta.clocks))
         if i in gta.invariants:
             d.and_constr(gta.invariants[i])
-        waiting.append((i, d))
+        d.free(inactive_clocks[i])
+        key = d.get_min_global_bound().get_value_abs()
+        heapq.heappush(waiting, (key, count, i, d))
+        count += 1
+        visited.add((i, get_visited_dbm(d, m, get_local(lu_bounds, i))))
 
     not_visited = set(gta.locations)
 
-    m = gta.get_max_clock_guard()
-
     while (len(not_visited) > 0) and (len(waiting) > 0):
-        (loc, zone) = waiting.pop(0)
-        visited.append((loc, zone.get_dbm()))
+        (_, _, loc, zone) = heapq.heappop(waiting)
 
         if loc in not_visited:
             not_visited.remove(loc)
@@ -41,13 +91,23 @@ def get_min_reach_times(gta: "GTA"):
             min_reach[loc] = zone.get_min_global_bound()
 
         for t in gta.get_transitions_for_state(loc):
-            zone = gta.successor(zone, gta.transitions[t])
-            zone.extrapolate(m, math.inf)  # type: ignore
-            loc = gta.transitions[t].target_loc
-            if (loc, zone.get_dbm()) not in visited:
-                waiting.append((loc, zone))
-
-        waiting = sorted(waiting, key=lambda x: x[1])
+            successor_zone = gta.successor(zone, gta.transitions[t])
+            # bounds of an empty zone are meaningless
+            if not successor_zone.is_not_empty():
+                continue
+            successor_loc = gta.transitions[t].target_loc
+            successor_zone.free(inactive_clocks[successor_loc])
+            successor_visited = (
+                successor_loc,
+                get_visited_dbm(
+                    successor_zone, m, get_local(lu_bounds, successor_loc)
+                ),
+            )
+            if successor_visited not in visited:
+                visited.add(successor_visited)
+                key = successor_zone.get_min_global_bound().get_value_abs()
+                heapq.heappush(waiting, (key, count, successor_loc, successor_zone))
+                count += 1
 
     end_time = time.process_time()
     print(f" \t Finding delta max took {end_time - start_time}s")
@@ -0,0 +1,88 @@
+# type: ignore
+""" Unit tests for the backward reachability analysis"""
+
+import math
+import unittest
+
+from dbm.bound import Bound
+from dbm.constraint import Constraint
+from dtn.backward_reach import is_reachable
+from dtn.dtn_minus import DTNMinus
+from dtn.gta import GTA, to_gta_transitions
+from examples.examples_dtns import (
+    example_1_ta,
+    example_2_ta,
+    example_3_ta,
+    ta_example_5,
+    example_6_ta,
+)
+from examples.examples_minreach import star_4
+
+
+class TestBackwardReach(unittest.TestCase):
+    """Unit tests for backward reachability"""
+
+    def test_summary_automaton(self):
+        # a location of the summary automaton is reachable within time T iff
+        # its minimal reach time is at most T
+        for ta in [example_1_ta, example_3_ta, ta_example_5, star_4]:
+            algo = DTNMinus(ta)
+            summary, _ = algo.get_summary_automaton()
+            for loc, t in algo.get_min_reach_time().items():
+                if t == math.inf:
+                    self.assertFalse(is_reachable(summary, [loc], 100), loc)
+                    continue
+                self.assertTrue(is_reachable(summary, [loc], t), loc)
+                if t > 0:
+                    self.assertFalse(is_reachable(summary, [loc], t - 1), loc)
+
+    def test_location_guards(self):
+        # with the reach times of the guard locations, the guarded automaton
+        # is checked directly
+        for ta in [example_1_ta, example_2_ta, example_3_ta, example_6_ta, star_4]:
+            self.assertGreater(ta.get_n_location_guards(), 0)
+            min_reach_times = DTNMinus(ta).get_min_reach_time()
+            algo = DTNMinus(ta)
+            algo.min_reach_time_for(ta.get_guarding_locations())
+            guards = algo.min_reach
+            for loc, t in min_reach_times.items():
+                if t == math.inf:
+                    self.assertFalse(is_reachable(ta, [loc], 100, guards), loc)
+                    continue
+                self.assertTrue(is_reachable(ta, [loc], t, guards), loc)
+                if t > 0:
+                    self.assertFalse(is_reachable(ta, [loc], t - 1, guards), loc)
+
+    def test_strict_location_guard(self):
+        # g is reached at x = delta > 1, a location guard on g thus requires
+        # delta > 1 and q1, which needs x ≤ 1, is unreachable
+        transitions = {
+            "t0": {
+                "source_loc": "q0",
+                "clock_guard": [Constraint("0", "x", Bound.le(-1))],
+                "target_loc": "g",
+            },
+            "t1": {
+                "source_loc": "q0",
+                "clock_guard": [Constraint("x", "0", Bound.leq(1))],
+                "loc_guard": "g",
+                "target_loc": "q1",
+            },
+            "t2": {
+                "source_loc": "q0",
+                "clock_guard": [Constraint("x", "0", Bound.leq(2))],
+                "loc_guard": "g",
+                "target_loc": "q2",
+            },
+        }
+        ta = GTA(
+            ["q0", "q1", "q2", "g"], ["q0"], to_gta_transitions(transitions), {}, ["x"]
+        )
+        algo = DTNMinus(ta)
+        algo.min_reach_time_for(["g"])
+        self.assertEqual(algo.min_reach["g"], Bound.le(-1))
+
+        guards = algo.min_reach
+        self.assertFalse(is_reachable(ta, ["q1"], 100, guards))
+        self.assertTrue(is_reachable(ta, ["q2"], 2, guards))
+        self.assertFalse(is_reachable(ta, ["q2"], 1, guards))
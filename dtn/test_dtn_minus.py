@@ -1,10 +1,17 @@
 # type: ignore
 """ Unit tests for DTN⁻ structures"""
 
+# pylint: disable=protected-access
+
+import os
+import tempfile
 import unittest
 import math
+from unittest import mock
 
 from dtn.gta import GTA, to_gta_transitions, Constraint
+from dbm.dbm_compact import CompactDBM
+from dbm.dbm_global import Extrapolation
 from dtn.dtn_minus import DTNMinus, Bound
 from examples.examples_dtns import (
     example_1_ta,
@@ -150,6 +157,8 @@ class TestDTNMinus(unittest.TestCase):
     def test_example5(self):
         algo = DTNMinus(ta_example_5)
         self.assertEqual(algo.get_min_reach_time(), {"q1": 0, "q2": 3, "q3": 5})
+        # q3 is reached exactly at delta max, which is not a truncated bound
+        self.assertEqual(algo.delta_max, 5)
 
     def test_example6(self):
         algo = DTNMinus(example_6_ta)
@@ -158,6 +167,198 @@ class TestDTNMinus(unittest.TestCase):
             {"q1": 0, "q2": 3, "q3": 2, "q4": 2, "q5": 4, "q6": math.inf, "q7": 5},
         )
 
+    def test_truncated_min_reach_time(self):
+        # the unguarded automaton reaches all locations by time 1, but q1 is
+        # only reached at 4 once g has been reached, after delta max 2
+        transitions = {
+            "t0": {
+                "source_loc": "q0",
+                "clock_guard": [Constraint("0", "x", Bound.leq(-1))],
+                "target_loc": "g",
+            },
+            "t1": {
+                "source_loc": "q0",
+                "clock_guard": [Constraint("0", "x", Bound.leq(-4))],
+                "reset_clocks": ["x"],
+                "target_loc": "q0",
+            },
+            "t2": {
+                "source_loc": "q0",
+                "clock_guard": [Constraint("x", "0", Bound.leq(0))],
+                "loc_guard": "g",
+                "target_loc": "q1",
+            },
+        }
+        ta = GTA(["q0", "q1", "g"], ["q0"], to_gta_transitions(transitions), {}, ["x"])
+        for options in [{}, {"subsumption": True, "compact": True}]:
+            algo = DTNMinus(ta, **options)
+            self.assertEqual(algo.delta_max, 2)
+            self.assertEqual(algo.get_min_reach_time(), {"q0": 0, "q1": 4, "g": 1})
+            self.assertEqual(algo.delta_max, 4)
+
+            algo = DTNMinus(ta, **options)
+            self.assertEqual(algo.min_reach_time_for(["q1"]), {"q1": 4})
+
+            # locations are yielded once, q1 after the search has been restarted
+            algo = DTNMinus(ta, **options)
+            reached = [(loc, b.get_value_abs()) for loc, b, _ in algo.iter_min_reach()]
+            self.assertEqual(reached, [("q0", 0), ("g", 1), ("q1", 4)])
+
+    def test_subsumption(self):
+        for ta in [
+            example_1_ta,
+            example_2_ta,
+            example_3_ta,
+            example_4_ta,
+            ta_example_5,
+            example_6_ta,
+            star_4,
+        ]:
+            self.assertEqual(
+                DTNMinus(ta, subsumption=True).get_min_reach_time(),
+                DTNMinus(ta).get_min_reach_time(),
+            )
+
+    def test_compact(self):
+        for ta in [example_1_ta, example_3_ta, ta_example_5, star_4]:
+            for subsumption in [False, True]:
+                algo = DTNMinus(ta, subsumption=subsumption, compact=True)
+                expected = DTNMinus(ta, subsumption=subsumption)
+                self.assertEqual(
+                    algo.get_min_reach_time(), expected.get_min_reach_time()
+                )
+                self.assertEqual(algo.min_reach_zones, expected.min_reach_zones)
+
+                # explored nodes only keep their compact zone
+                for processing in algo._DTNMinus__processing_set.values():
+                    for stored, entry in processing.items():
+                        self.assertIsInstance(stored, CompactDBM)
+                        self.assertIsNone(entry.zone)
+
+    def test_extrapolation(self):
+        for ta in [example_1_ta, example_2_ta, example_3_ta, ta_example_5, star_4]:
+            expected = DTNMinus(ta).get_min_reach_time()
+            for extrapolation in Extrapolation:
+                self.assertEqual(
+                    DTNMinus(ta, extrapolation=extrapolation).get_min_reach_time(),
+                    expected,
+                    f"failed extrapolation {extrapolation}",
+                )
+
+    def test_active_clocks(self):
+        for ta in [example_1_ta, example_2_ta, example_3_ta, ta_example_5, star_4]:
+            expected = DTNMinus(ta).get_min_reach_time()
+            for extrapolation in Extrapolation:
+                self.assertEqual(
+                    DTNMinus(
+                        ta, extrapolation=extrapolation, active_clocks=True
+                    ).get_min_reach_time(),
+                    expected,
+                    f"failed extrapolation {extrapolation}",
+                )
+
+    def test_min_reach_time_for(self):
+        for ta in [example_1_ta, example_3_ta, ta_example_5, star_4]:
+            expected = DTNMinus(ta).get_min_reach_time()
+            for loc in ta.locations:
+                self.assertEqual(
+                    DTNMinus(ta).min_reach_time_for([loc]), {loc: expected[loc]}
+                )
+
+            # a stopped search continues to the full result
+            algo = DTNMinus(ta)
+            result = algo.min_reach_time_for(ta.locations, horizon=5)
+            for loc in ta.locations:
+                self.assertEqual(
+                    result[loc], expected[loc] if expected[loc] <= 5 else math.inf
+                )
+            self.assertEqual(algo.get_min_reach_time(), expected)
+
+    def test_iter_min_reach(self):
+        for ta in [example_1_ta, example_3_ta, ta_example_5, star_4]:
+            expected = DTNMinus(ta).get_min_reach_time()
+            algo = DTNMinus(ta)
+            reached = []
+            for loc, bound, zone in algo.iter_min_reach():
+                self.assertEqual(bound.get_value_abs(), expected[loc])
+                self.assertEqual(zone.get_min_global_bound(), bound)
+                reached.append(loc)
+
+            # locations are reached in the order of their min reach times
+            self.assertEqual(len(reached), len(set(reached)))
+            self.assertEqual(
+                [expected[loc] for loc in reached],
+                sorted(expected[loc] for loc in reached),
+            )
+            self.assertEqual(
+                set(reached), {q for q in ta.locations if expected[q] != math.inf}
+            )
+            self.assertEqual(algo.get_min_reach_time(), expected)
+
+    def test_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "star_4.ckpt")
+            for options in [{}, {"subsumption": True, "compact": True}]:
+                full = DTNMinus(star_4, **options)
+                expected = full.get_min_reach_time()
+
+                # stop the search halfway and continue from the checkpoint
+                algo = DTNMinus(star_4, **options)
+                algo.min_reach_time_for(star_4.locations, horizon=5)
+                algo.save_checkpoint(path)
+                resumed = DTNMinus.resume(star_4, path)
+                self.assertEqual(resumed.subsumption, algo.subsumption)
+                self.assertEqual(resumed.compact, algo.compact)
+                self.assertEqual(resumed.get_min_reach_time(), expected)
+                for loc in star_4.locations:
+                    self.assertEqual(
+                        resumed.min_reach_zones[loc], full.min_reach_zones[loc]
+                    )
+
+                # a finished search is saved at the end
+                finished = DTNMinus.resume(star_4, path)
+                self.assertEqual(finished.min_reach, full.min_reach)
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "star_4.ckpt")
+            algo = DTNMinus(star_4)
+            algo.min_reach_time_for(["q0"])
+            algo.save_checkpoint(path)
+
+            # resuming restores the search without starting a new one
+            with mock.patch(
+                "dtn.dtn_minus.get_min_reach_times", side_effect=AssertionError
+            ):
+                resumed = DTNMinus.resume(star_4, path)
+            self.assertEqual(resumed.min_reach, algo.min_reach)
+            self.assertEqual(resumed.delta_max, algo.delta_max)
+
+            # checkpoints of other automata are rejected
+            with self.assertRaises(ValueError):
+                DTNMinus.resume(star_5, path)
+
+    def test_checkpoint_early_stop(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "star_4.ckpt")
+            expected = DTNMinus(star_4).get_min_reach_time()
+
+            # a query stopped at the horizon saves its state
+            algo = DTNMinus(star_4, checkpoint_path=path)
+            algo.min_reach_time_for(["q0"], horizon=5)
+            resumed = DTNMinus.resume(star_4, path)
+            self.assertEqual(resumed.min_reach, algo.min_reach)
+
+            # so does an iteration the caller stops
+            os.remove(path)
+            algo = DTNMinus(star_4, checkpoint_path=path)
+            iterator = algo.iter_min_reach()
+            first, _, _ = next(iterator)
+            iterator.close()
+            resumed = DTNMinus.resume(star_4, path)
+            self.assertEqual(resumed.min_reach_time_for([first]), {first: 0})
+            self.assertEqual(resumed.get_min_reach_time(), expected)
+
     def test_min_reach_4(self):
         algo = DTNMinus(star_4)
         self.assertEqual(
@@ -11,6 +11,7 @@ from dtn.gta import GTA, to_gta_transitions
 from dtn.dtn_with_inv import DTNWithInv
 from dbm.constraint import Constraint
 from dbm.bound import Bound
+from dbm.dbm_global import DBMG
 
 
 class TestDTNWithInv(unittest.TestCase):
@@ -128,3 +129,49 @@ class TestDTNWithInv(unittest.TestCase):
         alg = DTNWithInv(example_4_ta)
         self.assertEqual(alg.check_valid_summary_automaton(), True)
         self.assertEqual(alg.cutoff, 9)
+
+    def test_min_reach_zones_not_merged(self):
+        # the flooding check inspects every zone reaching a location at its
+        # minimal reach time
+        alg = DTNWithInv(example_4_ta)
+        zone_counts = {loc: len(list(f)) for loc, f in alg.min_reach_zones.items()}
+        self.assertEqual(
+            zone_counts,
+            {
+                "syH": 2,
+                "syL": 1,
+                "0H": 2,
+                "1H": 2,
+                "2H": 2,
+                "3H": 2,
+                "0L": 1,
+                "1L": 2,
+                "2L": 2,
+                "3L": 2,
+            },
+        )
+
+        # 1H is reached at 2 by x ≤ 2 with and without an upper bound on the
+        # global clock, an exact merge would keep only the second zone
+        inf = Bound.unbounded()
+        self.assertEqual(
+            list(alg.min_reach_zones["1H"]),
+            [
+                DBMG(
+                    ["x"],
+                    m=[
+                        [Bound.leq(0), Bound.leq(0), Bound.leq(-2)],
+                        [Bound.leq(2), Bound.leq(0), Bound.leq(-2)],
+                        [Bound.leq(4), Bound.leq(2), Bound.leq(0)],
+                    ],
+                ),
+                DBMG(
+                    ["x"],
+                    m=[
+                        [Bound.leq(0), Bound.leq(0), Bound.leq(-2)],
+                        [Bound.leq(2), Bound.leq(0), Bound.leq(-2)],
+                        [inf, inf, Bound.leq(0)],
+                    ],
+                ),
+            ],
+        )
@@ -2,6 +2,8 @@
 
 import unittest
 
+from dbm.bound import Bound
+from dbm.constraint import Constraint
 from dtn.gta import GTA, to_gta_transitions
 
 
@@ -79,3 +81,95 @@ class TestGTA(unittest.TestCase):
         for ta, state, expected_trails in test_cases:
             ta.get_trails_for_state("a")
             self.assertEqual(ta.get_trails_for_state(state), expected_trails)
+
+    def test_lu_bounds(self):
+        ta = GTA(
+            ["a", "b"],
+            ["a"],
+            to_gta_transitions(
+                {
+                    "t0": {
+                        "source_loc": "a",
+                        "target_loc": "b",
+                        "clock_guard": [
+                            Constraint("0", "x", Bound.le(-3)),
+                            Constraint("y", "0", Bound.leq(5)),
+                        ],
+                    },
+                    "t1": {
+                        "source_loc": "b",
+                        "target_loc": "a",
+                        "clock_guard": [Constraint("0", "x", Bound.leq(-1))],
+                    },
+                }
+            ),
+            {"b": Constraint("x", "0", Bound.leq(7))},
+            ["x", "y", "z"],
+        )
+        self.assertEqual(ta.get_lu_bounds(), ({"x": 3}, {"y": 5, "x": 7}))
+
+    def test_local_lu_bounds(self):
+        # x is compared against 10 in c and 2 in a, but the constant 10 does
+        # not reach a as x is reset on the way from a to b
+        ta = GTA(
+            ["a", "b", "c"],
+            ["a"],
+            to_gta_transitions(
+                {
+                    "t0": {
+                        "source_loc": "a",
+                        "target_loc": "b",
+                        "reset_clocks": ["x"],
+                        "clock_guard": [Constraint("x", "0", Bound.leq(2))],
+                    },
+                    "t1": {
+                        "source_loc": "b",
+                        "target_loc": "c",
+                        "clock_guard": [Constraint("0", "y", Bound.leq(-1))],
+                    },
+                    "t2": {
+                        "source_loc": "c",
+                        "target_loc": "a",
+                        "clock_guard": [Constraint("0", "x", Bound.leq(-10))],
+                    },
+                }
+            ),
+            {},
+            ["x", "y"],
+        )
+        self.assertEqual(
+            ta.get_local_lu_bounds(),
+            {
+                "a": ({"y": 1}, {"x": 2}),
+                "b": ({"y": 1, "x": 10}, {"x": 2}),
+                "c": ({"x": 10, "y": 1}, {"x": 2}),
+            },
+        )
+
+    def test_active_clocks(self):
+        # x is reset before it is read in b and y is never read
+        ta = GTA(
+            ["a", "b", "c"],
+            ["a"],
+            to_gta_transitions(
+                {
+                    "t0": {
+                        "source_loc": "a",
+                        "target_loc": "b",
+                        "reset_clocks": ["x"],
+                    },
+                    "t1": {
+                        "source_loc": "b",
+                        "target_loc": "c",
+                        "clock_guard": [Constraint("0", "x", Bound.leq(-1))],
+                    },
+                }
+            ),
+            {},
+            ["x", "y"],
+        )
+        self.assertEqual(ta.get_active_clocks(), {"a": set(), "b": {"x"}, "c": set()})
+        self.assertEqual(
+            ta.get_inactive_clocks(),
+            {"a": ["x", "y"], "b": ["y"], "c": ["x", "y"]},
+        )
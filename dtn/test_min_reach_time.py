@@ -0,0 +1,76 @@
+# type: ignore
+""" Unit tests for the minimal reach times of the unguarded automaton"""
+
+import unittest
+import math
+
+from dtn.min_reach_time import get_min_reach_times
+from dtn.dtn_minus import DTNMinus
+from examples.examples_dtns import (
+    example_1_ta,
+    example_2_ta,
+    example_4_ta,
+    ta_example_5,
+    example_6_ta,
+    gcs_3,
+    gcs_4,
+)
+
+
+def min_reach_times(gta):
+    return {q: b.get_value_abs() for q, b in get_min_reach_times(gta).items()}
+
+
+class TestMinReachTime(unittest.TestCase):
+    """Unit tests for get_min_reach_times"""
+
+    def test_example_1(self):
+        self.assertEqual(
+            min_reach_times(example_1_ta),
+            {"q1": 0, "q2": 5, "q3": 0, "q4": math.inf},
+        )
+
+    def test_example_2(self):
+        self.assertEqual(
+            min_reach_times(example_2_ta),
+            {"q1": 0, "q2": 0, "q3": 2, "q4": 5, "q5": 10, "q6": 0},
+        )
+
+    def test_example_6(self):
+        self.assertEqual(
+            min_reach_times(example_6_ta),
+            {"q1": 0, "q2": 3, "q3": 2, "q4": 2, "q5": 4, "q6": 0, "q7": 5},
+        )
+
+    def test_gcs(self):
+        self.assertEqual(
+            min_reach_times(gcs_4),
+            {
+                "syH": 0,
+                "syL": 0,
+                "0H": 0,
+                "1H": 2,
+                "2H": 0,
+                "3H": 0,
+                "0L": 0,
+                "1L": 0,
+                "2L": 1,
+                "3L": 0,
+            },
+        )
+
+    def test_delta_max(self):
+        # delta max before the search, the maximal finite reach time times the
+        # number of location guards plus one
+        expected = [
+            (example_1_ta, 10),
+            (example_2_ta, 20),
+            (example_4_ta, 10),
+            (ta_example_5, 5),
+            (example_6_ta, 10),
+            (gcs_3, 8),
+            (gcs_4, 10),
+        ]
+        for gta, delta_max in expected:
+            self.assertEqual(DTNMinus(gta).delta_max, delta_max)
+
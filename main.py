@@ -2,19 +2,44 @@
     provided in the paper.
 
     By specifying the `--extended` flag, you can execute the MINREACH
-    computation for even bigger examples.
+    computation for even bigger examples. With `--checkpoint <dir>`, the
+    extended runs save their state to the given directory and continue from
+    an existing checkpoint when restarted.
 """
 
+import os
 import time
 import sys
 
+from typing import Optional
+
 from dtn.dtn_with_inv import DTNWithInv
 from dtn.dtn_minus import DTNMinus
+from dtn.gta import GTA
 from examples.examples_dtns import gcs_3, gcs_4  # type: ignore
 from examples.examples_minreach import star_4, star_5, star_6, star_7, star_8  # type: ignore
 
 
+def new_dtn_minus(gta: "GTA", name: str, checkpoint_dir: Optional[str]) -> DTNMinus:
+    """Creates the DTNMinus for a benchmark, which is resumed from its
+    checkpoint in `checkpoint_dir` if there is one
+    """
+    if checkpoint_dir is None:
+        return DTNMinus(gta)
+
+    path = os.path.join(checkpoint_dir, f"{name}.ckpt")
+    if os.path.exists(path):
+        print(f"Resuming from checkpoint {path}")
+        return DTNMinus.resume(gta, path)
+    return DTNMinus(gta, checkpoint_path=path)
+
+
 def main():
+    checkpoint_dir = None
+    if "--checkpoint" in sys.argv[1:-1]:
+        checkpoint_dir = sys.argv[sys.argv.index("--checkpoint") + 1]
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
     print("Starting to execute benchmarks ...\n")
 
     print("Starting MinReach benchmark...")
@@ -42,17 +67,17 @@ def main():
     print("Computed summary automaton successfully.")
     print(f"Total CPU time: {time.process_time() - start_time}s\n")
 
-    if len(sys.argv) > 1 and sys.argv[1] == "--extended":
+    if "--extended" in sys.argv[1:]:
         print("MinReach for Star(7):")
         start_time = time.process_time()
-        alg = DTNMinus(star_7)
+        alg = new_dtn_minus(star_7, "star_7", checkpoint_dir)
         alg.get_summary_automaton()
         print("Computed summary automaton successfully.")
         print(f"Total CPU time: {time.process_time() - start_time}s\n")
 
         print("MinReach for Star(8):")
         start_time = time.process_time()
-        alg = DTNMinus(star_8)
+        alg = new_dtn_minus(star_8, "star_8", checkpoint_dir)
         alg.get_summary_automaton()
         print("Computed summary automaton successfully.")
         print(f"Total CPU time: {time.process_time() - start_time}s\n")